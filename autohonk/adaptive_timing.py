@@ -0,0 +1,348 @@
+"""
+Elite Dangerous Adaptive Timing - Per-Commander Delay Calibration
+Learns the smallest delays that still register in the game by correlating injected inputs
+with confirming journal / Status.json changes, then persists them per commander.
+
+Usage:
+- python adaptive_timing.py show               (list learned profiles)
+- python adaptive_timing.py fixture PATH [autohonk|input_broadcast]  (write a synthetic fixture)
+- python adaptive_timing.py replay [fixture]   (replay a fixture and report latency and misses)
+
+Requirements:
+- None (standard library only, so both autohonk.py and input_broadcast.py can use it)
+"""
+
+import importlib
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+# Configuration
+CONFIG = {
+    'profile_folder': Path(__file__).resolve().parent / 'timing_profiles',
+    'shrink_factor': 0.85,  # Multiply a delay by this after enough confirmed successes
+    'backoff_factor': 1.5,  # Multiply a delay by this after a miss
+    'successes_to_shrink': 3,  # Consecutive confirmations needed before tightening
+    'miss_expiry': 20,  # Confirmations after a miss before the value that missed may be retried
+}
+
+# Hard floors (seconds) for every delay the tools use. The starting value and ceiling of
+# each delay is the tool's own CONFIG value, passed in by the tool.
+DELAY_MINIMUMS = {
+    'delay_after_jump': 0.25,  # autohonk.py: FSDJump -> honk
+    'focus_settle': 0.02,  # SetForegroundWindow -> first key
+    'key_send_delay': 0.005,  # input_broadcast.py: between keys
+    'window_switch_delay': 0.02,  # input_broadcast.py: between windows
+}
+
+# Synthetic fixtures: typical smallest working value of each delay, as a fraction of its CONFIG value
+FIXTURE_FRACTIONS = {
+    'delay_after_jump': 0.45,
+    'focus_settle': 0.3,
+    'key_send_delay': 0.3,
+    'window_switch_delay': 0.27,
+}
+
+
+class AdaptiveDelay:
+    """A single delay that tightens on confirmed inputs and backs off on misses."""
+
+    def __init__(self, name: str, default: float, minimum: float,
+                 current: Optional[float] = None, miss_ceiling: float = 0.0,
+                 successes_since_miss: int = 0):
+        self.name = name
+        self.default = default
+        self.minimum = min(minimum, default)
+        self.current = default if current is None else min(max(current, self.minimum), default)
+        self.last_good = self.current  # Last value the game confirmed
+        self.miss_ceiling = miss_ceiling  # Largest value that missed recently
+        # A miss can be noise (focus stolen, player docked), so the ceiling expires
+        self.successes_since_miss = successes_since_miss
+        self.successes = 0
+        self.misses = 0
+        self.trials = 0
+
+    def success(self):
+        """Record an input that was confirmed by the game."""
+        self.trials += 1
+        self.successes += 1
+        self.successes_since_miss += 1
+        self.last_good = self.current
+        if self.successes_since_miss >= CONFIG['miss_expiry']:
+            self.miss_ceiling = 0.0
+        if self.successes < CONFIG['successes_to_shrink']:
+            return
+
+        self.successes = 0
+        candidate = max(self.minimum, self.current * CONFIG['shrink_factor'])
+        # Don't tighten back into a value that missed recently
+        if candidate > self.miss_ceiling:
+            self.current = candidate
+
+    def miss(self):
+        """Record an input that the game never confirmed."""
+        self.trials += 1
+        self.misses += 1
+        self.successes = 0
+        self.successes_since_miss = 0
+        self.miss_ceiling = max(self.miss_ceiling, self.current)
+        self.current = min(self.default, self.current * CONFIG['backoff_factor'])
+        self.last_good = max(self.last_good, self.current)
+
+    def to_dict(self) -> dict:
+        return {
+            'current': round(self.current, 4),
+            'miss_ceiling': round(self.miss_ceiling, 4),
+            'successes_since_miss': self.successes_since_miss,
+        }
+
+
+class TimingProfile:
+    """All adaptive delays for one commander, persisted as JSON.
+
+    One input only says whether *something* was too short, so each trial probes a
+    single delay (`probes`, in rotation) while the others stay at their last confirmed
+    value. A miss then only backs off the delay that was being tightened.
+    """
+
+    def __init__(self, commander: str, defaults: Dict[str, float], folder: Optional[Path] = None,
+                 probes: Sequence[str] = ()):
+        self.commander = commander
+        self.folder = Path(folder) if folder else CONFIG['profile_folder']
+        self.lock = threading.Lock()
+        # Each tool passes its CONFIG delays: they are where learning starts and the ceiling for backoff
+        self.delays: Dict[str, AdaptiveDelay] = {
+            name: AdaptiveDelay(name, default, DELAY_MINIMUMS.get(name, 0.0))
+            for name, default in defaults.items()
+        }
+        self.probes = list(probes)
+        self.probe_index = 0
+
+    @property
+    def probe(self) -> Optional[str]:
+        """The delay the next trial is testing."""
+        return self.probes[self.probe_index % len(self.probes)] if self.probes else None
+
+    @property
+    def path(self) -> Path:
+        safe_name = ''.join(c for c in self.commander if c.isalnum() or c in '-_') or 'unknown'
+        return self.folder / f"{safe_name}.json"
+
+    def get(self, name: str) -> float:
+        """Delay in seconds: the value under test for the probed delay, else the last confirmed one."""
+        with self.lock:
+            delay = self.delays[name]
+            if not self.probes or name == self.probe:
+                return delay.current
+            return delay.last_good
+
+    def record(self, name: str, confirmed: bool):
+        """Feed the outcome of one injected input back into the named delay."""
+        with self.lock:
+            delay = self.delays[name]
+            if confirmed:
+                delay.success()
+            else:
+                delay.miss()
+
+    def record_probe(self, confirmed: bool) -> Optional[str]:
+        """Feed one trial back into the probed delay; returns the delay it was attributed to."""
+        name = self.probe
+        if name is None:
+            return None
+        self.record(name, confirmed)
+        with self.lock:
+            # Move on once this delay has tightened or backed off
+            if self.delays[name].successes == 0:
+                self.probe_index += 1
+        return name
+
+    def load(self) -> 'TimingProfile':
+        """Load learned values from disk, ignoring a missing or corrupt profile."""
+        try:
+            if self.path.exists():
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                for name, values in data.get('delays', {}).items():
+                    if name in self.delays:
+                        delay = self.delays[name]
+                        self.delays[name] = AdaptiveDelay(
+                            name, delay.default, delay.minimum,
+                            current=values.get('current'),
+                            miss_ceiling=values.get('miss_ceiling', 0.0),
+                            successes_since_miss=values.get('successes_since_miss', 0),
+                        )
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load timing profile {self.path}: {e}")
+        return self
+
+    def save(self):
+        """Write learned values to disk, keeping delays another tool learned for this commander."""
+        with self.lock:
+            delays = {name: delay.to_dict() for name, delay in self.delays.items()}
+        try:
+            if self.path.exists():
+                delays = {**json.loads(self.path.read_text(encoding='utf-8')).get('delays', {}), **delays}
+        except (OSError, ValueError):
+            pass  # Corrupt profile - overwrite it
+        data = {'commander': self.commander, 'delays': delays}
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+        except OSError as e:
+            print(f"⚠️ Could not save timing profile {self.path}: {e}")
+
+
+class ConfirmationWatcher:
+    """Watches Status.json fields that a command changes (not fuel, heat or position)."""
+
+    def __init__(self, path: Path, fields: Sequence[str] = ('Flags', 'Flags2', 'GuiFocus')):
+        self.path = Path(path)
+        self.fields = tuple(fields)
+
+    def snapshot(self) -> Optional[tuple]:
+        """The watched field values, or None if the file is missing or mid-write."""
+        try:
+            status = json.loads(self.path.read_text(encoding='utf-8'))
+            return tuple(status.get(field) for field in self.fields)
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def wait_for_change(self, before: tuple, timeout: float, poll: float = 0.02) -> bool:
+        """Return True if a watched field differs from `before` within `timeout` seconds."""
+        deadline = time.time() + timeout
+        while True:
+            current = self.snapshot()
+            if current is not None and current != before:
+                return True
+            if time.time() >= deadline:
+                return False
+            time.sleep(poll)
+
+    def confirm_in_background(self, before: tuple, timeout: float, on_result: Callable[[bool], None]):
+        """Wait for confirmation on a daemon thread so the sender never blocks."""
+        def wait():
+            on_result(self.wait_for_change(before, timeout))
+        threading.Thread(target=wait, daemon=True).start()
+
+
+def load_profile(commander: str, defaults: Dict[str, float], probes: Sequence[str] = ()) -> TimingProfile:
+    """Load (or create) the timing profile for a commander, probing `probes` in rotation.
+
+    `defaults` are the tool's CONFIG values for the delays it uses.
+    """
+    return TimingProfile(commander, defaults, probes=probes).load()
+
+
+def generate_fixture(tool: str = 'autohonk', trials: int = 200, seed: int = 0) -> dict:
+    """Synthetic fixture for a tool: per trial, the smallest value of each delay that registers.
+
+    The tool's own CONFIG values and TIMING_PROBES are used, so replay sees the same
+    defaults and probe rotation the tool runs live.
+    """
+    if tool == 'input_broadcast':
+        # input_broadcast.py lives in the repo root
+        sys.path.append(str(Path(__file__).resolve().parent.parent))
+    module = importlib.import_module(tool)
+    defaults = {name: module.CONFIG[name] for name in module.TIMING_PROBES}
+
+    rng = random.Random(seed)
+    fixture = {'tool': tool, 'defaults': defaults, 'trials': []}
+    for _ in range(trials):
+        # Jitter models load, and the odd spike models four clients starting at once
+        spike = 2.5 if rng.random() < 0.03 else 1.0
+        fixture['trials'].append({
+            name: round(default * FIXTURE_FRACTIONS.get(name, 0.5) * rng.uniform(0.7, 1.3) * spike, 4)
+            for name, default in defaults.items()
+        })
+    return fixture
+
+
+def replay(fixture: dict, folder: Optional[Path] = None) -> dict:
+    """Replay a fixture through the same probe rotation the tools use and report latency and misses.
+
+    A trial registers only if every delay used in it is at least that trial's threshold.
+    """
+    defaults = fixture['defaults']
+    # A throwaway profile (never loaded or saved) so real learned values are untouched
+    profile = TimingProfile('replay', defaults, folder=folder, probes=list(defaults))
+    total_delay = 0.0
+    baseline_delay = 0.0
+    misses = 0
+    baseline_misses = 0
+    trials = 0
+    for thresholds in fixture['trials']:
+        used = {name: profile.get(name) for name in defaults}
+        confirmed = all(used[name] >= threshold for name, threshold in thresholds.items())
+        profile.record_probe(confirmed)
+        total_delay += sum(used.values())
+        baseline_delay += sum(defaults.values())
+        trials += 1
+        misses += not confirmed
+        baseline_misses += any(defaults[name] < threshold for name, threshold in thresholds.items())
+    return {
+        'trials': trials,
+        'misses': misses,
+        'miss_rate': misses / trials if trials else 0.0,
+        'baseline_misses': baseline_misses,
+        'total_delay': total_delay,
+        'baseline_delay': baseline_delay,
+        'final': {name: delay.current for name, delay in profile.delays.items()},
+    }
+
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point."""
+    command = argv[1] if len(argv) > 1 else 'show'
+
+    if command == 'show':
+        profiles = sorted(CONFIG['profile_folder'].glob('*.json')) if CONFIG['profile_folder'].exists() else []
+        if not profiles:
+            print("No timing profiles learned yet.")
+        for path in profiles:
+            try:
+                data = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not load timing profile {path}: {e}")
+                continue
+            print(f"📈 {data.get('commander', path.stem)}:")
+            for name, values in data.get('delays', {}).items():
+                print(f"   • {name}: {values.get('current', 0) * 1000:.0f} ms")
+        return 0
+
+    if command == 'fixture':
+        if len(argv) < 3:
+            print(__doc__)
+            return 1
+        tool = argv[3] if len(argv) > 3 else 'autohonk'
+        fixture = generate_fixture(tool)
+        # One trial per line so fixtures diff well when checked in
+        trials = ',\n'.join(f"  {json.dumps(trial)}" for trial in fixture['trials'])
+        Path(argv[2]).write_text(f'{{"tool": {json.dumps(tool)}, "defaults": {json.dumps(fixture["defaults"])}, '
+                                 f'"trials": [\n{trials}\n]}}\n', encoding='utf-8')
+        print(f"📝 Wrote {tool} fixture to {argv[2]}")
+        return 0
+
+    if command == 'replay':
+        if len(argv) > 2:
+            fixture = json.loads(Path(argv[2]).read_text(encoding='utf-8'))
+        else:
+            fixture = generate_fixture()
+        result = replay(fixture)
+        print(f"Trials: {result['trials']}  Misses: {result['misses']} ({result['miss_rate']:.1%}, "
+              f"fixed defaults: {result['baseline_misses']})")
+        print(f"Total delay: {result['total_delay']:.2f}s (fixed defaults: {result['baseline_delay']:.2f}s)")
+        for name, value in result['final'].items():
+            print(f"   • {name}: {value * 1000:.0f} ms")
+        return 0
+
+    print(f"Unknown command: {command}")
+    print(__doc__)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
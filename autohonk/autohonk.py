@@ -5,28 +5,32 @@ Modified to hold key until FSSDiscoveryScan event instead of fixed duration.
 
 Requirements:
 - pip install pywin32 watchdog
+- Optional: pip install msgspec (faster, allocation-light journal decoding)
 """
 
 import os
-import json
 import time
 import threading
 from pathlib import Path
 from typing import Optional
-import xml.etree.ElementTree as ET
-import glob
-import logging
-from datetime import datetime
+
+# Heavy modules load on first use so startup doesn't compete with the game clients for disk
+from lazy_imports import lazy_logger, lazy_module
 
 # Windows API imports
-import win32api
-import win32con
-import win32gui
-import win32process
+win32api = lazy_module('win32api')
+win32con = lazy_module('win32con')
+win32gui = lazy_module('win32gui')
+win32process = lazy_module('win32process')
+
+# Adaptive timing (same folder)
+adaptive_timing = lazy_module('adaptive_timing')
+
+# Historical journal index (same folder)
+journal_index = lazy_module('journal_index')
 
-# File monitoring
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+# Compact journal event records (same folder)
+journal_records = lazy_module('journal_records')
 
 # Configuration
 CONFIG = {
@@ -36,19 +40,18 @@ CONFIG = {
     'key_press_interval': 0.1,  # How often to send key presses (for continuous hold)
     'auto_detect_primary_fire': True,  # Auto-detect from bindings
     'manual_key_override': None,  # Set to specific key if needed (e.g., 'numpad_add')
+    'adaptive_timing': False,  # Learn the shortest delay_after_jump / focus settle per commander
+    'focus_settle': 0.2,  # Wait after focusing the window before pressing keys
+    'update_journal_index': True,  # Keep journal_index.sqlite up to date as new lines arrive
+    'background_discovery': True,  # Read bindings / open the journal index after monitoring starts
     'journal_folder': Path.home() / 'Saved Games' / 'Frontier Developments' / 'Elite Dangerous'
 }
 
-# Logging setup
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('elite_autohonk.log')
-    ]
-)
-logger = logging.getLogger(__name__)
+# Delays autohonk learns, tested one at a time
+TIMING_PROBES = ('delay_after_jump', 'focus_settle')
+
+# Logging setup (configured on first log record)
+logger = lazy_logger(__name__, 'elite_autohonk.log')
 
 class AutoHonk:
     def __init__(self):
@@ -59,24 +62,48 @@ class AutoHonk:
         self.honking_active = False
         self.honk_thread = None
         self.honk_lock = threading.Lock()
-        
-        # Detect primary fire key on startup
-        self.detect_primary_fire_key()
+        self.commander = None
+        self.timing_profile = None
+        self.scan_confirmed = False
+        self.bindings_ready = threading.Event()
+    
+    def print_banner(self):
+        """Print the startup banner."""
+        if self.bindings_ready.is_set():
+            detected_key = self.primary_fire_key or 'Not detected'
+        else:
+            detected_key = 'Detecting in background...'
         
         print("=" * 60)
         print("Elite Dangerous AutoHonk - Standalone (FSS Discovery Mode)")
         print("=" * 60)
         print(f"Monitoring journal folder: {CONFIG['journal_folder']}")
         print(f"Looking for window containing: '{CONFIG['window_title_contains']}'")
-        print(f"Detected primary fire key: {self.primary_fire_key or 'Not detected'}")
+        print(f"Detected primary fire key: {detected_key}")
         print(f"Max honk duration (safety): {CONFIG['max_honk_duration']} seconds")
+        print(f"Adaptive timing: {'On' if CONFIG['adaptive_timing'] else 'Off'}")
         print("Will honk until FSSDiscoveryScan event is detected...")
         print("Waiting for FSD jumps...")
         print("-" * 60)
     
+    def start_discovery(self):
+        """Detect the Primary Fire key, in the background if background_discovery is on."""
+        if CONFIG['background_discovery']:
+            threading.Thread(target=self.discover, daemon=True).start()
+        else:
+            self.discover()
+    
+    def discover(self):
+        """Read the bindings and signal that the honk key is known."""
+        self.detect_primary_fire_key()
+        self.bindings_ready.set()
+        if CONFIG['background_discovery']:
+            print(f"🔑 Detected primary fire key: {self.primary_fire_key or 'Not detected'}")
+    
     def detect_primary_fire_key(self):
         """Detect Primary Fire key from Elite Dangerous bindings."""
         try:
+            import xml.etree.ElementTree as ET  # Only needed once, to read the bindings
             bindings_dir = Path(os.environ.get('LOCALAPPDATA')) / "Frontier Developments" / "Elite Dangerous" / "Options" / "Bindings"
             
             if not bindings_dir.exists():
@@ -132,6 +159,22 @@ class AutoHonk:
         
         return key_mapping.get(elite_key, elite_key.lower())
     
+    def get_delay(self, name: str) -> float:
+        """Get a delay from the commander's learned profile, or the fixed CONFIG value."""
+        if CONFIG['adaptive_timing'] and self.timing_profile:
+            return self.timing_profile.get(name)
+        return CONFIG[name]
+    
+    def record_timing(self, confirmed: bool):
+        """Feed whether the honk registered back into the delay being probed."""
+        if not (CONFIG['adaptive_timing'] and self.timing_profile):
+            return
+        
+        name = self.timing_profile.record_probe(confirmed)
+        self.timing_profile.save()
+        print(f"📈 Timing {'confirmed' if confirmed else 'missed'} - {name} now "
+              f"{self.timing_profile.delays[name].current:.2f}s")
+    
     def find_elite_window(self) -> Optional[int]:
         """Find Elite Dangerous window handle by process name and window title."""
         def enum_windows_callback(hwnd, windows):
@@ -213,10 +256,11 @@ class AutoHonk:
             
             # Bring window to foreground
             win32gui.SetForegroundWindow(elite_hwnd)
-            time.sleep(0.2)  # Brief delay to ensure focus
+            time.sleep(self.get_delay('focus_settle'))  # Brief delay to ensure focus
             
             start_time = time.time()
             key_down = False
+            timed_out = False
             
             while self.honking_active and self.running:
                 # Send key down if not already down
@@ -229,6 +273,7 @@ class AutoHonk:
                 elapsed = time.time() - start_time
                 if elapsed >= CONFIG['max_honk_duration']:
                     print(f"⏰ Timeout reached ({CONFIG['max_honk_duration']}s) - stopping honk")
+                    timed_out = True
                     break
                 
                 # Short sleep to prevent excessive CPU usage
@@ -242,10 +287,31 @@ class AutoHonk:
             elapsed = time.time() - start_time
             print(f"✅ Honking complete! Duration: {elapsed:.1f} seconds")
             
+            # Only a scan or a timeout says anything about the timing; a new jump does not
+            if self.scan_confirmed or timed_out:
+                self.record_timing(self.scan_confirmed)
+            
         except Exception as e:
             print(f"❌ Error during continuous keypress: {e}")
             logger.error(f"Continuous keypress error: {e}")
     
+    def choose_honk_key(self) -> str:
+        """Determine which key to use, waiting briefly if bindings are still loading."""
+        if CONFIG['manual_key_override']:
+            key_to_use = CONFIG['manual_key_override']
+            print(f"   Using manual key override: {key_to_use}")
+            return key_to_use
+        
+        if CONFIG['auto_detect_primary_fire']:
+            self.bindings_ready.wait(timeout=5.0)
+            if self.primary_fire_key:
+                print(f"   Using detected Primary Fire key: {self.primary_fire_key}")
+                return self.primary_fire_key
+        
+        key_to_use = '1'  # Default fallback
+        print(f"   Using fallback key: {key_to_use}")
+        return key_to_use
+    
     def start_honking(self, key: str):
         """Start the honking process in a separate thread."""
         with self.honk_lock:
@@ -254,6 +320,7 @@ class AutoHonk:
                 return
             
             self.honking_active = True
+            self.scan_confirmed = False
             self.honk_thread = threading.Thread(target=self.continuous_keypress, args=(key,), daemon=True)
             self.honk_thread.start()
     
@@ -270,14 +337,24 @@ class AutoHonk:
             if self.honk_thread and self.honk_thread.is_alive():
                 self.honk_thread.join(timeout=1.0)
     
-    def process_journal_entry(self, entry: dict):
+    def set_commander(self, commander: Optional[str]):
+        """Track which commander this journal belongs to for per-commander timing."""
+        if commander and commander != self.commander:
+            self.commander = commander
+            if CONFIG['adaptive_timing']:
+                self.timing_profile = adaptive_timing.load_profile(
+                    commander, {name: CONFIG[name] for name in TIMING_PROBES}, TIMING_PROBES)
+                print(f"📈 Loaded timing profile for {commander}: "
+                      f"{self.timing_profile.get('delay_after_jump'):.2f}s after jump")
+    
+    def process_journal_entry(self, entry: 'journal_records.JournalEvent'):
         """Process a journal entry and trigger honk if needed."""
         try:
-            event_type = entry.get('event')
-            timestamp = entry.get('timestamp', 'Unknown')
+            event_type = entry.event
+            timestamp = entry.timestamp or 'Unknown'
             
             if event_type == 'FSDJump':
-                new_system = entry.get('StarSystem')
+                new_system = entry.star_system
                 if new_system and new_system != self.current_system:
                     print(f"\n🚀 FSD JUMP DETECTED!")
                     print(f"   Time: {timestamp}")
@@ -289,44 +366,37 @@ class AutoHonk:
                     # Stop any existing honking first
                     self.stop_honking()
                     
-                    # Determine which key to use
-                    key_to_use = None
-                    if CONFIG['manual_key_override']:
-                        key_to_use = CONFIG['manual_key_override']
-                        print(f"   Using manual key override: {key_to_use}")
-                    elif CONFIG['auto_detect_primary_fire'] and self.primary_fire_key:
-                        key_to_use = self.primary_fire_key
-                        print(f"   Using detected Primary Fire key: {key_to_use}")
-                    else:
-                        key_to_use = '1'  # Default fallback
-                        print(f"   Using fallback key: {key_to_use}")
-                    
                     # Schedule the honk
-                    print(f"   Waiting {CONFIG['delay_after_jump']} seconds before honking...")
+                    delay_after_jump = self.get_delay('delay_after_jump')
+                    print(f"   Waiting {delay_after_jump:.2f} seconds before honking...")
                     
                     def delayed_honk():
-                        time.sleep(CONFIG['delay_after_jump'])
-                        self.start_honking(key_to_use)
+                        time.sleep(delay_after_jump)
+                        self.start_honking(self.choose_honk_key())
                     
                     # Run in separate thread so it doesn't block file monitoring
                     threading.Thread(target=delayed_honk, daemon=True).start()
             
             elif event_type == 'FSSDiscoveryScan':
                 # This is the event that tells us the discovery scan is complete
-                bodies_count = entry.get('BodyCount', 'Unknown')
-                non_bodies_count = entry.get('NonBodyCount', 'Unknown')
+                bodies_count = entry.body_count if entry.body_count is not None else 'Unknown'
+                non_bodies_count = entry.non_body_count if entry.non_body_count is not None else 'Unknown'
                 print(f"\n📡 FSS DISCOVERY SCAN COMPLETE!")
                 print(f"   Time: {timestamp}")
                 print(f"   Bodies found: {bodies_count}")
                 print(f"   Non-body signals: {non_bodies_count}")
                 
                 # Stop honking
+                self.scan_confirmed = True
                 self.stop_honking()
                 print("-" * 60)
                     
-            elif event_type in ['Location', 'LoadGame', 'StartUp']:
+            elif event_type in ['Commander', 'LoadGame']:
+                self.set_commander(entry.commander_name())
+            
+            if event_type in ['Location', 'LoadGame', 'StartUp']:
                 # Track current system from these events too
-                system = entry.get('StarSystem')
+                system = entry.star_system
                 if system and system != self.current_system:
                     self.current_system = system
                     print(f"📍 Current system: {system}")
@@ -334,14 +404,43 @@ class AutoHonk:
         except Exception as e:
             logger.error(f"Error processing journal entry: {e}")
 
-class JournalMonitor(FileSystemEventHandler):
+class JournalMonitor:
+    """Watchdog event handler (duck-typed so watchdog itself can be imported lazily)."""
+    
     def __init__(self, autohonk: AutoHonk):
         self.autohonk = autohonk
         self.current_file = None
         self.file_position = 0
+        self.journal_index = None
         
         # Find the latest journal file
         self.find_latest_journal()
+        
+        if CONFIG['background_discovery']:
+            threading.Thread(target=self.finish_startup, daemon=True).start()
+        else:
+            self.finish_startup()
+    
+    def finish_startup(self):
+        """Work that can wait until the observer is running: commander and journal index."""
+        if self.current_file:
+            self.learn_commander(self.current_file, self.file_position)
+        if CONFIG['update_journal_index']:
+            self.open_journal_index()
+    
+    def open_journal_index(self):
+        """Open the historical journal index; new lines are indexed once it is ready."""
+        try:
+            self.journal_index = journal_index.JournalIndex()
+        except Exception as e:
+            logger.error(f"Error opening journal index: {e}")
+    
+    def dispatch(self, event):
+        """Route watchdog events to the handlers below."""
+        if event.event_type == 'modified':
+            self.on_modified(event)
+        elif event.event_type == 'created':
+            self.on_created(event)
     
     def find_latest_journal(self):
         """Find and start monitoring the latest journal file."""
@@ -359,6 +458,24 @@ class JournalMonitor(FileSystemEventHandler):
         except Exception as e:
             logger.error(f"Error finding journal files: {e}")
     
+    def learn_commander(self, file_path: Path, end: int):
+        """Pick up the commander from lines written before we started, since we tail from the end."""
+        try:
+            commander = None
+            with open(file_path, 'rb') as f:
+                for line in f:
+                    if line.startswith(b'{') and (b'"event":"Commander"' in line or b'"event":"LoadGame"' in line):
+                        entry = journal_records.decode_event(line)
+                        if entry is not None:
+                            commander = entry.commander_name() or commander
+                    if f.tell() >= end:
+                        break
+            # The tailer may already have seen a newer Commander/LoadGame line
+            if self.autohonk.commander is None:
+                self.autohonk.set_commander(commander)
+        except Exception as e:
+            logger.error(f"Error reading commander from journal: {e}")
+    
     def on_modified(self, event):
         """Handle file modification events."""
         if event.is_directory:
@@ -396,14 +513,20 @@ class JournalMonitor(FileSystemEventHandler):
                 for line in new_lines:
                     line = line.strip()
                     if line:
-                        try:
-                            entry = json.loads(line)
+                        entry = journal_records.decode_event(line)
+                        if entry is not None:  # Skip invalid JSON lines
                             self.autohonk.process_journal_entry(entry)
-                        except json.JSONDecodeError:
-                            pass  # Skip invalid JSON lines
                             
         except Exception as e:
             logger.error(f"Error reading journal file: {e}")
+            return
+        
+        # Index after the honk logic has seen the lines so it never delays a honk
+        if self.journal_index:
+            try:
+                self.journal_index.index_file(file_path)
+            except Exception as e:
+                logger.error(f"Error updating journal index: {e}")
 
 def main():
     """Main function to start the AutoHonk monitor."""
@@ -416,6 +539,9 @@ def main():
         input("Press Enter to exit...")
         return
     
+    # File monitoring
+    from watchdog.observers import Observer
+    
     # Initialize AutoHonk
     autohonk = AutoHonk()
     
@@ -424,8 +550,10 @@ def main():
     observer = Observer()
     observer.schedule(event_handler, str(CONFIG['journal_folder']), recursive=False)
     
-    # Start monitoring
+    # Start monitoring first, then read bindings while events are already being accepted
     observer.start()
+    autohonk.start_discovery()
+    autohonk.print_banner()
     
     try:
         print("\n✅ AutoHonk is running! Press Ctrl+C to stop.")
@@ -0,0 +1,213 @@
+"""
+Elite Dangerous Journal Bulk Parser - Multi-Core Backfills
+Splits the journal corpus by file and by newline-aligned byte ranges of large files,
+parses the pieces in a ProcessPoolExecutor over memory-mapped input, and streams the
+results back in timestamp order as they complete. journal_index.py uses it to backfill.
+
+Usage:
+- python journal_bulk.py bench [--gb 1] [--workers 1 2 4 8]   (MB/s per worker count)
+
+Requirements:
+- None (standard library only)
+"""
+
+import argparse
+import heapq
+import json
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Configuration
+CONFIG = {
+    'chunk_bytes': 32 * 1024 * 1024,  # Large journals are split into ranges of about this size
+    'prefetch_per_worker': 2,  # Parsed chunks kept ahead of the merge, per worker
+}
+
+# (path, start, end) byte range of one file, always starting and ending on a line boundary
+Chunk = Tuple[str, int, int]
+
+
+def plan_chunks(paths: Iterable[Path], chunk_bytes: Optional[int] = None) -> List[Chunk]:
+    """Split files into newline-aligned byte ranges of roughly `chunk_bytes`."""
+    chunk_bytes = chunk_bytes or CONFIG['chunk_bytes']
+    chunks = []
+    for path in paths:
+        size = os.path.getsize(path)
+        if size == 0:
+            continue
+        if size <= chunk_bytes:
+            chunks.append((str(path), 0, size))
+            continue
+
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                end = min(start + chunk_bytes, size)
+                if end < size:
+                    # Move the boundary forward to just after the next newline
+                    newline = mm.find(b'\n', end)
+                    end = size if newline == -1 else newline + 1
+                chunks.append((str(path), start, end))
+                start = end
+    return chunks
+
+
+def full_entry(entry: dict) -> dict:
+    """Default projection: keep the whole journal entry."""
+    return entry
+
+
+def summarize(entry: dict) -> tuple:
+    """Compact projection for backfills that only need what the index stores: (event, commander, system)."""
+    event = entry.get('event')
+    commander = entry.get('Name') if event == 'Commander' else entry.get('Commander')
+    return (event, commander, entry.get('StarSystem'))
+
+
+def first_timestamp(path: Path) -> str:
+    """Timestamp of a journal's first line, used to start merging it at the right time."""
+    try:
+        with open(path, 'rb') as f:
+            return json.loads(f.readline()).get('timestamp', '')
+    except (OSError, ValueError, AttributeError):
+        return ''
+
+
+def parse_chunk(task: Tuple[Chunk, Callable]) -> List[tuple]:
+    """Worker: parse one byte range into (timestamp, path, offset, projected entry) rows."""
+    (path, start, end), project = task
+    rows = []
+    loads = json.loads
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            newline = mm.find(b'\n', pos, end)
+            if newline == -1:
+                break  # Partial line still being written
+            line = mm[pos:newline]
+            if line.strip():
+                try:
+                    entry = loads(line)
+                    rows.append((entry.get('timestamp', ''), path, pos, project(entry)))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    pass  # Skip invalid JSON lines
+            pos = newline + 1
+    # Journals are written in order, so this is almost always already sorted
+    rows.sort(key=lambda row: row[:3])
+    return rows
+
+
+def parse_corpus(paths: Iterable[Path], workers: Optional[int] = None, project: Callable = full_entry,
+                 chunk_bytes: Optional[int] = None) -> Iterator[tuple]:
+    """Parse every journal in parallel and yield (timestamp, path, offset, entry) in timestamp order.
+
+    Rows are yielded while later chunks are still being parsed: chunks are submitted in
+    order of each file's first timestamp, only a few ahead of the merge, and a file joins
+    the merge once the merge reaches its first timestamp. Only complete lines are parsed.
+    `project` runs in the worker processes, so it must be a module-level function.
+    """
+    workers = workers or os.cpu_count() or 1
+    prefetch = workers * CONFIG['prefetch_per_worker']
+    starts = sorted((first_timestamp(path), str(path)) for path in paths)
+    chunks = plan_chunks([path for _, path in starts], chunk_bytes)
+    chunks_by_file: Dict[str, List[int]] = {}
+    for index, (path, _, _) in enumerate(chunks):
+        chunks_by_file.setdefault(path, []).append(index)
+
+    # Even a single worker goes through the pool, so every count pays the same spawn/pickle costs
+    executor = ProcessPoolExecutor(max_workers=workers)
+    futures: Dict[int, Future] = {}
+    submitted = 0
+
+    def take(index: int) -> List[tuple]:
+        nonlocal submitted
+        while submitted <= index or (len(futures) < prefetch and submitted < len(chunks)):
+            futures[submitted] = executor.submit(parse_chunk, (chunks[submitted], project))
+            submitted += 1
+        return futures.pop(index).result()
+
+    def file_rows(path: str) -> Iterator[tuple]:
+        for index in chunks_by_file.get(path, ()):
+            yield from take(index)
+
+    try:
+        waiting = deque(starts)
+        heap = []
+        while heap or waiting:
+            # Bring in every file that starts before the next row to yield
+            while waiting and (not heap or waiting[0][0] <= heap[0][0][0]):
+                order, (_, path) = len(starts) - len(waiting), waiting.popleft()
+                rows = file_rows(path)
+                row = next(rows, None)
+                if row is not None:
+                    heapq.heappush(heap, (row[:3], order, row, rows))
+            if not heap:
+                continue
+            _, order, row, rows = heapq.heappop(heap)
+            yield row
+            row = next(rows, None)
+            if row is not None:
+                heapq.heappush(heap, (row[:3], order, row, rows))
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def bench(args) -> int:
+    """Report bulk parse throughput at each worker count on a generated corpus."""
+    # The corpus generator lives with the index benchmark
+    from journal_index import generate_corpus
+
+    corpus = Path(args.corpus) if args.corpus else Path(tempfile.mkdtemp(prefix='journal_corpus_'))
+    project = full_entry if args.full else summarize
+    try:
+        if not any(corpus.glob('Journal.*.log')):
+            print(f"📝 Generating {args.gb:.2f} GB corpus in {corpus}...")
+            generate_corpus(corpus, int(args.gb * 1024 ** 3))
+        paths = sorted(corpus.glob('Journal.*.log'))
+        total_mb = sum(p.stat().st_size for p in paths) / 1024 ** 2
+        chunks = plan_chunks(paths)
+        print(f"📦 {total_mb:.0f} MB in {len(paths)} files -> {len(chunks)} chunks "
+              f"({os.cpu_count()} CPUs, {'full entries' if args.full else 'summary projection'})")
+
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            count = sum(1 for _ in parse_corpus(paths, workers=workers, project=project))
+            elapsed = time.perf_counter() - start
+            rate = total_mb / elapsed
+            baseline = baseline or rate
+            print(f"⚙️ {workers} worker(s): {count:,} events in {elapsed:.1f}s = {rate:.1f} MB/s "
+                  f"({rate / baseline:.2f}x)")
+    finally:
+        if not args.corpus:
+            shutil.rmtree(corpus, ignore_errors=True)
+    return 0
+
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Parse Elite Dangerous journals on all cores.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    benchmark = commands.add_parser('bench', help='MB/s at several worker counts')
+    benchmark.add_argument('--gb', type=float, default=1.0, help='corpus size to generate')
+    benchmark.add_argument('--corpus', help='reuse/keep a corpus folder instead of a temp dir')
+    benchmark.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    benchmark.add_argument('--full', action='store_true', help='return whole entries (includes pickling cost)')
+
+    args = parser.parse_args(argv[1:])
+    if args.command == 'bench':
+        return bench(args)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,588 @@
+"""
+Elite Dangerous Journal Index - Historical Event Index and Query CLI
+Streams every Journal.*.log once into a compact SQLite index (timestamp, commander,
+event type, system, file, byte offset), then keeps it up to date incrementally from
+autohonk.py's journal tailer. Journals that were never indexed are backfilled on all
+cores (journal_bulk.py). Queries run against the index instead of re-parsing JSON.
+
+Usage:
+- python journal_index.py build [folder ...] [--workers N]  (index all journals, incremental)
+- python journal_index.py jumps [--by commander|day]  (FSD jump counts)
+- python journal_index.py honk-scan                   (FSDJump -> FSSDiscoveryScan times)
+- python journal_index.py route --commander NAME      (jump history)
+- python journal_index.py bench [--gb 2]              (generate a corpus and benchmark)
+
+Requirements:
+- None (standard library only)
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+# Compact journal event records (same folder)
+from journal_records import decode_event
+
+# Multi-core parser for backfills (same folder)
+from journal_bulk import parse_corpus, summarize
+
+# Configuration
+CONFIG = {
+    'journal_folder': Path.home() / 'Saved Games' / 'Frontier Developments' / 'Elite Dangerous',
+    'index_path': Path(__file__).resolve().parent / 'journal_index.sqlite',
+    'batch_rows': 50000,  # Rows per executemany while backfilling
+    'backfill_workers': None,  # Processes used to backfill an empty index (None = all cores)
+}
+
+# Every journal line starts with timestamp and event, so most lines never need json.loads
+HEAD_RE = re.compile(rb'^\{\s*"timestamp":\s*"([^"]+)",\s*"event":\s*"([^"]+)"')
+
+# Events whose body we need: commander name, or the system they happened in
+COMMANDER_EVENTS = {b'Commander', b'LoadGame'}
+SYSTEM_EVENTS = {b'FSDJump', b'Location', b'CarrierJump'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    indexed_offset INTEGER NOT NULL DEFAULT 0,
+    commander INTEGER,
+    pending_jump INTEGER  -- offset of the last FSDJump still waiting for its FSSDiscoveryScan
+);
+CREATE TABLE IF NOT EXISTS commanders (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS event_types (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS systems (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS events (
+    ts INTEGER NOT NULL,
+    commander INTEGER,
+    event INTEGER NOT NULL,
+    system INTEGER,
+    file INTEGER NOT NULL,
+    offset INTEGER NOT NULL
+);
+-- Jumps are what almost every query is about, so they get their own small table
+CREATE TABLE IF NOT EXISTS jumps (
+    ts INTEGER NOT NULL,
+    commander INTEGER,
+    system INTEGER,
+    file INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    scan_ts INTEGER
+);
+CREATE INDEX IF NOT EXISTS jumps_by_commander ON jumps (commander, ts);
+CREATE INDEX IF NOT EXISTS jumps_by_time ON jumps (ts);
+CREATE INDEX IF NOT EXISTS jumps_by_position ON jumps (file, offset);
+"""
+EVENTS_INDEX = 'CREATE INDEX IF NOT EXISTS events_by_type ON events (event, commander, ts)'
+
+
+def parse_timestamp(value: str) -> int:
+    """Journal timestamps are UTC ISO-8601 ('2024-01-01T12:00:00Z')."""
+    return int(datetime.fromisoformat(value[:19]).replace(tzinfo=timezone.utc).timestamp())
+
+
+class TimestampParser:
+    """parse_timestamp for raw journal bytes (or str), parsing each date only once."""
+
+    def __init__(self):
+        self.days: Dict[Union[bytes, str], int] = {}
+
+    def __call__(self, value: Union[bytes, str]) -> int:
+        day = value[:10]
+        day_start = self.days.get(day)
+        if day_start is None:
+            text = day if isinstance(day, str) else day.decode('ascii')
+            day_start = self.days[day] = parse_timestamp(text + 'T00:00:00')
+        return day_start + int(value[11:13]) * 3600 + int(value[14:16]) * 60 + int(value[17:19])
+
+
+def format_timestamp(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class JournalIndex:
+    """SQLite index over journal events, safe to update from the watchdog thread."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else CONFIG['index_path']
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(EVENTS_INDEX)
+        self.load_ids()
+        self.parse_ts = TimestampParser()
+
+    def load_ids(self):
+        """(Re)load the name -> id caches for the lookup tables."""
+        self.ids: Dict[str, Dict[str, int]] = {
+            table: {name: row_id for row_id, name in self.conn.execute(f'SELECT id, name FROM {table}')}
+            for table in ('commanders', 'event_types', 'systems')
+        }
+        # Event type ids keyed by the raw bytes seen in journal lines
+        self.event_ids: Dict[bytes, int] = {name.encode('utf-8'): row_id for name, row_id in self.ids['event_types'].items()}
+
+    @contextmanager
+    def transaction(self):
+        """Hold the write lock from the first read, so the autohonk tailer and a build running
+        in another process can never both index the same lines."""
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield
+            except BaseException:
+                self.conn.rollback()
+                self.load_ids()  # Ids handed out in the rolled-back transaction are gone
+                raise
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def lookup_id(self, table: str, name: Optional[str]) -> Optional[int]:
+        """Intern a commander / event type / system name as a small integer."""
+        if name is None:
+            return None
+        cache = self.ids[table]
+        row_id = cache.get(name)
+        if row_id is None:
+            # Another process may have added it since the cache was loaded
+            self.conn.execute(f'INSERT OR IGNORE INTO {table} (name) VALUES (?)', (name,))
+            row_id = self.conn.execute(f'SELECT id FROM {table} WHERE name = ?', (name,)).fetchone()[0]
+            cache[name] = row_id
+        return row_id
+
+    def index_folders(self, folders: Iterable[Path], workers: Optional[int] = None) -> dict:
+        """Index (or catch up on) every journal file in the given folders."""
+        files = []
+        for folder in folders:
+            files.extend(Path(folder).glob('Journal.*.log'))
+        files.sort(key=lambda x: x.stat().st_mtime)
+
+        # Journals never indexed before are backfilled on all cores; the rest are caught up one by one.
+        # One core parses faster with the regex fast path in index_file than with json.loads in a pool.
+        workers = workers or CONFIG['backfill_workers'] or os.cpu_count() or 1
+        with self.lock:
+            indexed = dict(self.conn.execute('SELECT path, indexed_offset FROM files'))
+        fresh = [path for path in files if not indexed.get(str(path))] if workers > 1 else []
+        fresh_paths = set(fresh)
+
+        # Mostly-new history is much faster to store without maintaining the B-tree per row
+        rebuild_index = len(fresh) > len(files) - len(fresh)
+        if rebuild_index:
+            with self.lock:
+                self.conn.execute('DROP INDEX IF EXISTS events_by_type')
+
+        totals = {'files': 0, 'events': 0, 'bytes': 0}
+        try:
+            results = [self.backfill(fresh, workers)] if fresh else []
+            results.extend(self.index_file(path) for path in files if path not in fresh_paths)
+            for result in results:
+                totals['files'] += result.get('files', 1)
+                totals['events'] += result['events']
+                totals['bytes'] += result['bytes']
+        finally:
+            if rebuild_index:
+                with self.lock:
+                    self.conn.execute(EVENTS_INDEX)
+                    self.conn.commit()
+        return totals
+
+    def backfill(self, files: List[Path], workers: Optional[int] = None) -> dict:
+        """Index whole journals with journal_bulk, storing rows as they stream in.
+
+        Same rows as index_file, but lines from all files arrive merged by timestamp, so the
+        commander and pending jump are tracked per file.
+        """
+        body_events = {name.decode('ascii') for name in COMMANDER_EVENTS | SYSTEM_EVENTS}
+        commander_events = {name.decode('ascii') for name in COMMANDER_EVENTS}
+        parse_ts = self.parse_ts
+        lookup_id = self.lookup_id
+        with self.transaction():
+            # path -> [file id, commander id, pending jump row, last indexed line offset]
+            states = {}
+            for path in files:
+                self.conn.execute('INSERT OR IGNORE INTO files (path) VALUES (?)', (str(path),))
+                file_id, offset = self.conn.execute(
+                    'SELECT id, indexed_offset FROM files WHERE path = ?', (str(path),)
+                ).fetchone()
+                if offset:
+                    continue  # Indexed by another process since index_folders looked
+                self.conn.execute('DELETE FROM jumps WHERE file = ?', (file_id,))
+                states[str(path)] = [file_id, None, None, None]
+            files = [Path(path) for path in states]
+
+            rows = []
+            jump_rows = []
+            events = 0
+            for ts_text, path, line_offset, (event, commander, system) in parse_corpus(files, workers, summarize):
+                if not isinstance(event, str):
+                    continue
+                try:
+                    ts = parse_ts(ts_text)
+                except (ValueError, TypeError):
+                    continue
+                state = states[path]
+                file_id = state[0]
+                system_id = None
+                if event in body_events:
+                    if event in commander_events:
+                        state[1] = lookup_id('commanders', commander)
+                    system_id = lookup_id('systems', system)
+                event_id = lookup_id('event_types', event)
+
+                if event == 'FSDJump':
+                    state[2] = [ts, state[1], system_id, file_id, line_offset, None]
+                    jump_rows.append(state[2])
+                elif event == 'FSSDiscoveryScan' and state[2] is not None:
+                    state[2][5] = ts
+                    state[2] = None
+
+                rows.append((ts, state[1], event_id, system_id, file_id, line_offset))
+                state[3] = line_offset
+                if len(rows) >= CONFIG['batch_rows']:
+                    self.conn.executemany('INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)', rows)
+                    events += len(rows)
+                    rows = []
+
+            if rows:
+                self.conn.executemany('INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)', rows)
+                events += len(rows)
+            if jump_rows:
+                self.conn.executemany('INSERT INTO jumps VALUES (?, ?, ?, ?, ?, ?)', jump_rows)
+
+            indexed = 0
+            for path, (file_id, commander_id, pending_row, last_offset) in states.items():
+                offset = 0
+                if last_offset is not None:
+                    # index_file carries on from the end of the last line stored here
+                    with open(path, 'rb') as f:
+                        f.seek(last_offset)
+                        offset = last_offset + len(f.readline())
+                indexed += offset
+                self.conn.execute(
+                    'UPDATE files SET indexed_offset = ?, commander = ?, pending_jump = ? WHERE id = ?',
+                    (offset, commander_id, pending_row[4] if pending_row else None, file_id),
+                )
+            return {'files': len(states), 'events': events, 'bytes': indexed}
+
+    def index_file(self, path: Path) -> dict:
+        """Index complete lines appended to a journal since it was last indexed."""
+        path = Path(path)
+        with self.transaction():
+            row = self.conn.execute(
+                'SELECT id, indexed_offset, commander, pending_jump FROM files WHERE path = ?', (str(path),)
+            ).fetchone()
+            if row is None:
+                file_id = self.conn.execute('INSERT INTO files (path) VALUES (?)', (str(path),)).lastrowid
+                offset, commander_id, pending_jump = 0, None, None
+            else:
+                file_id, offset, commander_id, pending_jump = row
+
+            size = path.stat().st_size
+            if size < offset:
+                # File was truncated or replaced - start it again from scratch
+                self.conn.execute('DELETE FROM events WHERE file = ?', (file_id,))
+                self.conn.execute('DELETE FROM jumps WHERE file = ?', (file_id,))
+                offset, commander_id, pending_jump = 0, None, None
+
+            start = offset
+            rows = []
+            jump_rows = []
+            pending_row = None  # Unflushed jump row for pending_jump, if it was read in this call
+            events = 0
+            event_ids = self.event_ids
+            parse_ts = self.parse_ts
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # Partial line still being written - pick it up next time
+                    line_offset = offset
+                    offset += len(line)
+
+                    head = HEAD_RE.match(line)
+                    if head is None:
+                        continue
+                    event = head.group(2)
+
+                    system_id = None
+                    if event in COMMANDER_EVENTS or event in SYSTEM_EVENTS:
+                        entry = decode_event(line)
+                        if entry is None:
+                            continue
+                        if event in COMMANDER_EVENTS:
+                            commander_id = self.lookup_id('commanders', entry.commander_name())
+                        system_id = self.lookup_id('systems', entry.star_system)
+
+                    event_id = event_ids.get(event)
+                    if event_id is None:
+                        event_id = event_ids[event] = self.lookup_id('event_types', event.decode('utf-8'))
+                    try:
+                        ts = parse_ts(head.group(1))
+                    except ValueError:
+                        continue
+
+                    if event == b'FSDJump':
+                        pending_row = [ts, commander_id, system_id, file_id, line_offset, None]
+                        jump_rows.append(pending_row)
+                        pending_jump = line_offset
+                    elif event == b'FSSDiscoveryScan' and pending_jump is not None:
+                        if pending_row is not None:
+                            pending_row[5] = ts
+                        else:
+                            self.conn.execute('UPDATE jumps SET scan_ts = ? WHERE file = ? AND offset = ?',
+                                              (ts, file_id, pending_jump))
+                        pending_row = pending_jump = None
+
+                    rows.append((ts, commander_id, event_id, system_id, file_id, line_offset))
+                    if len(rows) >= CONFIG['batch_rows']:
+                        self.conn.executemany('INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)', rows)
+                        events += len(rows)
+                        rows = []
+
+            if rows:
+                self.conn.executemany('INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)', rows)
+                events += len(rows)
+            if jump_rows:
+                self.conn.executemany('INSERT INTO jumps VALUES (?, ?, ?, ?, ?, ?)', jump_rows)
+            self.conn.execute(
+                'UPDATE files SET indexed_offset = ?, commander = ?, pending_jump = ? WHERE id = ?',
+                (offset, commander_id, pending_jump, file_id),
+            )
+            return {'events': events, 'bytes': offset - start}
+
+    def query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def jump_counts(self, by: str = 'commander', commander: Optional[str] = None,
+                    since: Optional[int] = None, until: Optional[int] = None) -> List[tuple]:
+        """FSD jump counts grouped by commander or by UTC day."""
+        group = "date(j.ts, 'unixepoch')" if by == 'day' else 'c.name'
+        sql = f"SELECT {group}, COUNT(*) FROM jumps j LEFT JOIN commanders c ON c.id = j.commander WHERE 1"
+        params = []
+        if commander:
+            sql += ' AND j.commander = (SELECT id FROM commanders WHERE name = ?)'
+            params.append(commander)
+        if since is not None:
+            sql += ' AND j.ts >= ?'
+            params.append(since)
+        if until is not None:
+            sql += ' AND j.ts < ?'
+            params.append(until)
+        sql += f' GROUP BY {group} ORDER BY {group}'
+        return self.query(sql, tuple(params))
+
+    def honk_scan_times(self, commander: Optional[str] = None) -> List[tuple]:
+        """(commander, seconds) from each FSDJump to the FSSDiscoveryScan that followed it."""
+        sql = ("SELECT c.name, j.scan_ts - j.ts FROM jumps j "
+               "LEFT JOIN commanders c ON c.id = j.commander "
+               "WHERE j.scan_ts IS NOT NULL")
+        params = ()
+        if commander:
+            sql += ' AND j.commander = (SELECT id FROM commanders WHERE name = ?)'
+            params = (commander,)
+        return self.query(sql, params)
+
+    def route(self, commander: Optional[str] = None, limit: int = 50) -> List[tuple]:
+        """Most recent jumps as (timestamp, commander, system), oldest first."""
+        sql = ("SELECT j.ts, c.name, s.name FROM jumps j "
+               "LEFT JOIN commanders c ON c.id = j.commander "
+               "LEFT JOIN systems s ON s.id = j.system")
+        params = []
+        if commander:
+            sql += ' WHERE j.commander = (SELECT id FROM commanders WHERE name = ?)'
+            params.append(commander)
+        sql += ' ORDER BY j.ts DESC LIMIT ?'
+        params.append(limit)
+        return list(reversed(self.query(sql, tuple(params))))
+
+
+def generate_corpus(folder: Path, total_bytes: int, commanders: int = 4, seed: int = 0) -> int:
+    """Write synthetic journals (about 16 MB each) until `total_bytes` have been written."""
+    rng = random.Random(seed)
+    folder.mkdir(parents=True, exist_ok=True)
+    systems = [f"Synuefe {chr(65 + i % 26)}{chr(65 + i // 26 % 26)}-{i % 10} d{i % 97}" for i in range(5000)]
+    ts = int(datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp())
+    written = 0
+    file_number = 0
+
+    def stamp() -> str:
+        return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    while written < total_bytes:
+        commander = f"CMDR{file_number % commanders}"
+        path = folder / f"Journal.{file_number:06d}.01.log"
+        lines = [
+            f'{{ "timestamp":"{stamp()}", "event":"Fileheader", "part":1, "gameversion":"4.0.0.1900" }}',
+            f'{{ "timestamp":"{stamp()}", "event":"Commander", "FID":"F{file_number}", "Name":"{commander}" }}',
+            f'{{ "timestamp":"{stamp()}", "event":"LoadGame", "Commander":"{commander}", "Ship":"Anaconda" }}',
+        ]
+        size = sum(len(line) + 1 for line in lines)
+        while size < 16 * 1024 * 1024 and written + size < total_bytes:
+            ts += rng.randint(30, 90)
+            system = rng.choice(systems)
+            batch = [
+                f'{{ "timestamp":"{stamp()}", "event":"StartJump", "JumpType":"Hyperspace", "StarSystem":"{system}" }}',
+                f'{{ "timestamp":"{stamp()}", "event":"FSDJump", "StarSystem":"{system}", "SystemAddress":{rng.getrandbits(40)}, '
+                f'"StarPos":[{rng.uniform(-1000, 1000):.5f},{rng.uniform(-1000, 1000):.5f},{rng.uniform(-1000, 1000):.5f}], '
+                f'"JumpDist":{rng.uniform(10, 70):.3f}, "FuelUsed":{rng.uniform(1, 8):.6f} }}',
+            ]
+            ts += rng.randint(3, 9)
+            batch.append(f'{{ "timestamp":"{stamp()}", "event":"FSSDiscoveryScan", "Progress":0.0, '
+                         f'"BodyCount":{rng.randint(1, 60)}, "NonBodyCount":{rng.randint(0, 20)}, "SystemName":"{system}" }}')
+            for body in range(rng.randint(2, 8)):
+                batch.append(f'{{ "timestamp":"{stamp()}", "event":"Scan", "ScanType":"AutoScan", "BodyName":"{system} {body}", '
+                             f'"BodyID":{body}, "DistanceFromArrivalLS":{rng.uniform(0, 5000):.6f}, '
+                             f'"StarSystem":"{system}", "Radius":{rng.uniform(1e6, 1e9):.3f} }}')
+            batch.append(f'{{ "timestamp":"{stamp()}", "event":"Music", "MusicTrack":"Exploration" }}')
+            lines.extend(batch)
+            size += sum(len(line) + 1 for line in batch)
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write('\n'.join(lines) + '\n')
+        written += size
+        file_number += 1
+    return written
+
+
+def bench(args) -> int:
+    """Build an index over a generated corpus and time the queries."""
+    corpus = Path(args.corpus) if args.corpus else Path(tempfile.mkdtemp(prefix='journal_corpus_'))
+    db_path = corpus / 'bench_index.sqlite'
+    try:
+        if not any(corpus.glob('Journal.*.log')):
+            print(f"📝 Generating {args.gb:.2f} GB corpus in {corpus}...")
+            start = time.perf_counter()
+            written = generate_corpus(corpus, int(args.gb * 1024 ** 3))
+            print(f"   {written / 1024 ** 2:.0f} MB in {time.perf_counter() - start:.1f}s")
+        if db_path.exists():
+            db_path.unlink()
+
+        index = JournalIndex(db_path)
+        start = time.perf_counter()
+        totals = index.index_folders([corpus])
+        elapsed = time.perf_counter() - start
+        print(f"🗂️ Indexed {totals['events']:,} events from {totals['files']} files "
+              f"({totals['bytes'] / 1024 ** 2:.0f} MB) in {elapsed:.1f}s "
+              f"= {totals['bytes'] / 1024 ** 2 / elapsed:.1f} MB/s")
+        print(f"   Index size: {db_path.stat().st_size / 1024 ** 2:.0f} MB")
+
+        start = time.perf_counter()
+        index.index_folders([corpus])
+        print(f"🔁 Incremental re-check (no new data): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        for name, run in (
+            ('jumps by commander', lambda: index.jump_counts()),
+            ('jumps by day', lambda: index.jump_counts(by='day')),
+            ('honk-scan CMDR0', lambda: index.honk_scan_times('CMDR0')),
+            ('route CMDR1 (50)', lambda: index.route('CMDR1')),
+        ):
+            start = time.perf_counter()
+            rows = run()
+            print(f"⏱️ {name}: {len(rows)} rows in {(time.perf_counter() - start) * 1000:.1f} ms")
+        index.close()
+
+        if args.naive:
+            # What every query costs without an index: json.loads on every line
+            start = time.perf_counter()
+            jumps = 0
+            for path in corpus.glob('Journal.*.log'):
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if json.loads(line).get('event') == 'FSDJump':
+                            jumps += 1
+            print(f"🐢 Naive re-parse jump count: {jumps:,} in {time.perf_counter() - start:.1f}s")
+    finally:
+        if not args.corpus:
+            shutil.rmtree(corpus, ignore_errors=True)
+    return 0
+
+
+def parse_date(value: str) -> int:
+    return parse_timestamp(value if 'T' in value else value + 'T00:00:00')
+
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Index and query Elite Dangerous journals.')
+    parser.add_argument('--db', type=Path, default=CONFIG['index_path'], help='index database path')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='index all journals (incremental)')
+    build.add_argument('folders', nargs='*', type=Path, default=[CONFIG['journal_folder']])
+    build.add_argument('--workers', type=int, help='processes for the initial backfill (default: all cores)')
+
+    jumps = commands.add_parser('jumps', help='FSD jump counts')
+    jumps.add_argument('--by', choices=('commander', 'day'), default='commander')
+    jumps.add_argument('--commander')
+    jumps.add_argument('--since', type=parse_date, help='YYYY-MM-DD')
+    jumps.add_argument('--until', type=parse_date, help='YYYY-MM-DD')
+
+    honk = commands.add_parser('honk-scan', help='seconds from FSDJump to FSSDiscoveryScan')
+    honk.add_argument('--commander')
+
+    route = commands.add_parser('route', help='jump history')
+    route.add_argument('--commander')
+    route.add_argument('--limit', type=int, default=50)
+
+    benchmark = commands.add_parser('bench', help='benchmark on a generated corpus')
+    benchmark.add_argument('--gb', type=float, default=2.0, help='corpus size to generate')
+    benchmark.add_argument('--corpus', help='reuse/keep a corpus folder instead of a temp dir')
+    benchmark.add_argument('--naive', action='store_true', help='also time a full json.loads re-parse')
+
+    args = parser.parse_args(argv[1:])
+    if args.command == 'bench':
+        return bench(args)
+
+    index = JournalIndex(args.db)
+    start = time.perf_counter()
+    try:
+        if args.command == 'build':
+            totals = index.index_folders(args.folders, args.workers)
+            print(f"🗂️ Indexed {totals['events']:,} new events ({totals['bytes'] / 1024 ** 2:.1f} MB) "
+                  f"from {totals['files']} files")
+
+        elif args.command == 'jumps':
+            rows = index.jump_counts(args.by, args.commander, args.since, args.until)
+            for key, count in rows:
+                print(f"   • {key or 'Unknown'}: {count:,} jumps")
+            print(f"🚀 Total: {sum(count for _, count in rows):,} jumps")
+
+        elif args.command == 'honk-scan':
+            per_commander: Dict[str, List[int]] = {}
+            for commander, seconds in index.honk_scan_times(args.commander):
+                per_commander.setdefault(commander or 'Unknown', []).append(seconds)
+            if not per_commander:
+                print("No FSDJump -> FSSDiscoveryScan pairs found.")
+            for commander, times in sorted(per_commander.items()):
+                times.sort()
+                print(f"📡 {commander}: {len(times):,} scans, mean {sum(times) / len(times):.1f}s, "
+                      f"median {times[len(times) // 2]}s, p90 {times[int(len(times) * 0.9)]}s")
+
+        elif args.command == 'route':
+            for ts, commander, system in index.route(args.commander, args.limit):
+                print(f"   {format_timestamp(ts)}  {commander or 'Unknown':<20} {system}")
+    finally:
+        index.close()
+
+    print(f"⏱️ {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,116 @@
+"""
+Elite Dangerous Journal Records - Compact Journal Event Type
+Decodes journal lines straight into a __slots__ record that holds only the fields the tools
+use, with commander, system and event-type strings interned. Uses msgspec struct decoding
+when it is installed and falls back to json.loads otherwise.
+
+The fallback still builds the full json.loads dict before copying fields into the record,
+so it is slower per line than plain json.loads and allocates the same transient dict. It
+only saves memory for events that are kept (the journal index, long histories); install
+msgspec to also make decoding cheaper.
+
+Requirements:
+- None (optional: pip install msgspec)
+"""
+
+import json
+import sys
+from dataclasses import dataclass
+from typing import Optional, Union
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+intern = sys.intern
+
+
+if msgspec is not None:
+    class JournalEvent(msgspec.Struct, gc=False):
+        """One journal line, decoded by msgspec (unknown fields are skipped, never allocated)."""
+        timestamp: str
+        event: str
+        star_system: Optional[str] = msgspec.field(default=None, name='StarSystem')
+        name: Optional[str] = msgspec.field(default=None, name='Name')
+        commander: Optional[str] = msgspec.field(default=None, name='Commander')
+        body_count: Optional[int] = msgspec.field(default=None, name='BodyCount')
+        non_body_count: Optional[int] = msgspec.field(default=None, name='NonBodyCount')
+
+        def commander_name(self) -> Optional[str]:
+            """Commander this line identifies ('Commander' -> Name, 'LoadGame' -> Commander)."""
+            return self.name if self.event == 'Commander' else self.commander
+
+    _decoder = msgspec.json.Decoder(JournalEvent)
+else:
+    @dataclass(slots=True)
+    class JournalEvent:
+        """One journal line (only the fields the tools use)."""
+        timestamp: str
+        event: str
+        star_system: Optional[str] = None
+        name: Optional[str] = None
+        commander: Optional[str] = None
+        body_count: Optional[int] = None
+        non_body_count: Optional[int] = None
+
+        def commander_name(self) -> Optional[str]:
+            """Commander this line identifies ('Commander' -> Name, 'LoadGame' -> Commander)."""
+            return self.name if self.event == 'Commander' else self.commander
+
+    _decoder = None
+
+
+def _from_dict(entry: dict) -> Optional[JournalEvent]:
+    """Build a record from a json.loads dict, ignoring fields of unexpected types."""
+    event = entry.get('event')
+    if not isinstance(event, str):
+        return None
+
+    def text(key: str) -> Optional[str]:
+        value = entry.get(key)
+        return value if isinstance(value, str) else None
+
+    def number(key: str) -> Optional[int]:
+        value = entry.get(key)
+        return value if isinstance(value, int) else None
+
+    return JournalEvent(
+        timestamp=text('timestamp') or '',
+        event=event,
+        star_system=text('StarSystem'),
+        name=text('Name'),
+        commander=text('Commander'),
+        body_count=number('BodyCount'),
+        non_body_count=number('NonBodyCount'),
+    )
+
+
+def decode_event(line: Union[bytes, str]) -> Optional[JournalEvent]:
+    """Decode one journal line into a JournalEvent, or None if it isn't a valid event."""
+    record = None
+    if _decoder is not None:
+        try:
+            record = _decoder.decode(line)
+        except msgspec.DecodeError:
+            record = None  # Unusual field types - fall back to json below
+    if record is None:
+        try:
+            entry = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+        if not isinstance(entry, dict):
+            return None
+        record = _from_dict(entry)
+        if record is None:
+            return None
+
+    # The same few event types, systems and commanders repeat endlessly
+    record.event = intern(record.event)
+    if record.star_system is not None:
+        record.star_system = intern(record.star_system)
+    if record.name is not None and record.event == 'Commander':
+        record.name = intern(record.name)
+    if record.commander is not None:
+        record.commander = intern(record.commander)
+    return record
@@ -0,0 +1,54 @@
+"""
+Lazy imports for fast startup.
+lazy_module() stands in for a module (pywin32, msvcrt, ctypes, or a sibling tool module
+such as journal_index) and imports it the first time one of its attributes is used.
+lazy_logger() does the same for logging, so the logging package is only imported, and the
+log file only opened, once something is logged. Modules used in a single place (watchdog,
+xml.etree) are imported inside the function that needs them instead.
+
+Requirements:
+- None (standard library only)
+"""
+
+import importlib
+import threading
+
+
+class Lazy:
+    """Proxy that builds the real object on first attribute access."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._target = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    self._target = self._factory()
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+
+def lazy_module(name: str) -> Lazy:
+    """Import `name` on first use."""
+    return Lazy(lambda: importlib.import_module(name))
+
+
+def lazy_logger(name: str, log_file: str) -> Lazy:
+    """Configure console + file logging (file opened on first record) on first use."""
+    def build():
+        import logging
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[
+                logging.StreamHandler(),
+                logging.FileHandler(log_file, delay=True)
+            ]
+        )
+        return logging.getLogger(name)
+    return Lazy(build)
@@ -0,0 +1,227 @@
+"""
+Elite Dangerous Broadcast Scheduler - Focus-Change Minimization
+Orders broadcast targets so every command starts on the window that already has focus,
+skips refocusing the console while more commands are queued, and can batch several
+queued commands per focus visit ("interleave" mode).
+
+The scheduler only talks to a focus backend, so it runs against FakeFocusBackend
+without Windows or pywin32:
+- python broadcast_scheduler.py   (simulate all modes and report focus switches / time)
+"""
+
+import sys
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+MODES = ("sequential", "interleave")
+
+
+class WindowEntry:
+    """One Elite window found by input_broadcast.py (commander name interned)."""
+    __slots__ = ("hwnd", "title", "commander")
+
+    def __init__(self, hwnd: int, title: str, commander: str):
+        self.hwnd = hwnd
+        self.title = title
+        self.commander = sys.intern(commander)
+
+    def __repr__(self) -> str:
+        return f"WindowEntry(hwnd={self.hwnd!r}, title={self.title!r}, commander={self.commander!r})"
+
+
+class FocusBackend:
+    """Everything the scheduler needs from the desktop. Subclass for Win32 or tests."""
+
+    def get_foreground(self) -> Optional[int]:
+        raise NotImplementedError
+
+    def focus(self, window: WindowEntry):
+        """Bring the window to the foreground and wait for it to settle."""
+        raise NotImplementedError
+
+    def send(self, window: WindowEntry, command: str) -> bool:
+        """Send a command to the already focused window."""
+        raise NotImplementedError
+
+    def pause(self, window: WindowEntry):
+        """Pause after leaving a window, before focusing the next one."""
+        raise NotImplementedError
+
+    def restore(self, hwnd: int) -> bool:
+        """Give focus back to the console; False if it could not be refocused."""
+        raise NotImplementedError
+
+    def clock(self) -> float:
+        return time.perf_counter()
+
+
+class FakeFocusBackend(FocusBackend):
+    """In-memory backend with a virtual clock, for tests and simulations."""
+
+    def __init__(self, foreground: Optional[int] = None, focus_cost: float = 0.2,
+                 key_cost: float = 0.06, pause_cost: float = 0.3, restore_cost: float = 0.1):
+        self.foreground = foreground
+        self.focus_cost = focus_cost
+        self.key_cost = key_cost
+        self.pause_cost = pause_cost
+        self.restore_cost = restore_cost
+        self.now = 0.0
+        self.focus_calls: List[int] = []
+        self.sent: List[Tuple[int, str]] = []
+
+    def get_foreground(self) -> Optional[int]:
+        return self.foreground
+
+    def focus(self, window: WindowEntry):
+        self.foreground = window.hwnd
+        self.focus_calls.append(window.hwnd)
+        self.now += self.focus_cost
+
+    def send(self, window: WindowEntry, command: str) -> bool:
+        self.sent.append((window.hwnd, command))
+        self.now += self.key_cost * len(command)
+        return True
+
+    def pause(self, window: WindowEntry):
+        self.now += self.pause_cost
+
+    def restore(self, hwnd: int) -> bool:
+        self.foreground = hwnd
+        self.focus_calls.append(hwnd)
+        self.now += self.restore_cost
+        return True
+
+    def clock(self) -> float:
+        return self.now
+
+
+class BroadcastStats:
+    """Focus switches and wall time, per broadcast and cumulative."""
+
+    def __init__(self):
+        self.commands = 0
+        self.focus_switches = 0
+        self.sends = 0
+        self.successes = 0
+        self.elapsed = 0.0
+
+    def add(self, other: 'BroadcastStats'):
+        self.commands += other.commands
+        self.focus_switches += other.focus_switches
+        self.sends += other.sends
+        self.successes += other.successes
+        self.elapsed += other.elapsed
+
+    @property
+    def switches_per_command(self) -> float:
+        return self.focus_switches / self.commands if self.commands else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.commands} command(s), {self.successes}/{self.sends} sends, "
+                f"{self.focus_switches} focus switches ({self.switches_per_command:.2f}/command), "
+                f"{self.elapsed:.2f}s")
+
+
+class BroadcastScheduler:
+    """Send queued commands to every window with as few focus switches as possible."""
+
+    def __init__(self, backend: FocusBackend, mode: str = "sequential", interleave_batch: int = 4,
+                 console_hwnd: Optional[int] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown broadcast mode: {mode} (expected one of {', '.join(MODES)})")
+        self.backend = backend
+        self.mode = mode
+        # Commands sent per focus visit; sequential mode always sends one at a time
+        self.batch_size = interleave_batch if mode == "interleave" else 1
+        self.console_hwnd = console_hwnd
+        self.totals = BroadcastStats()
+
+    def order_windows(self, windows: Sequence[WindowEntry]) -> List[WindowEntry]:
+        """Config order, rotated so the window that already has focus goes first."""
+        foreground = self.backend.get_foreground()
+        for i, window in enumerate(windows):
+            if window.hwnd == foreground:
+                return list(windows[i:]) + list(windows[:i])
+        return list(windows)
+
+    def visit(self, window: WindowEntry, commands: Sequence[str], stats: BroadcastStats):
+        """Focus a window only if needed, then send it every command in the batch."""
+        stats.sends += len(commands)
+        if self.backend.get_foreground() != window.hwnd:
+            stats.focus_switches += 1
+            try:
+                self.backend.focus(window)
+            except Exception as e:
+                # Same as a failed send: skip this window, keep going with the rest
+                print(f"❌ Could not focus {window.commander}: {e}")
+                return
+        for command in commands:
+            try:
+                if self.backend.send(window, command):
+                    stats.successes += 1
+            except Exception as e:
+                print(f"❌ Error sending to {window.commander}: {e}")
+
+    def broadcast(self, commands: Sequence[str], windows: Sequence[WindowEntry],
+                  more_pending: Callable[[], bool] = lambda: False) -> BroadcastStats:
+        """Broadcast a batch of commands; refocus the console only if nothing else is queued."""
+        stats = BroadcastStats()
+        start = self.backend.clock()
+        stats.commands = len(commands)
+
+        if self.mode == "interleave":
+            groups = [list(commands)]
+        else:
+            groups = [[command] for command in commands]
+
+        try:
+            for group in groups:
+                ordered = self.order_windows(windows)
+                for i, window in enumerate(ordered):
+                    self.visit(window, group, stats)
+                    if i < len(ordered) - 1:
+                        self.backend.pause(window)
+        finally:
+            # Always hand focus back to the console, even if a window misbehaved
+            if self.console_hwnd and not more_pending():
+                if self.backend.get_foreground() != self.console_hwnd:
+                    if self.backend.restore(self.console_hwnd):
+                        stats.focus_switches += 1
+
+        stats.elapsed = self.backend.clock() - start
+        self.totals.add(stats)
+        return stats
+
+
+def simulate(commands: Sequence[str], window_count: int = 4) -> None:
+    """Compare the original config-order broadcast with each scheduler mode."""
+    console = 1
+    windows = [WindowEntry(100 + i, f"Elite - Dangerous (CLIENT) {i}", f"CMDR{i}") for i in range(window_count)]
+
+    # Original behaviour: focus every window in config order, refocus the console every time
+    backend = FakeFocusBackend(foreground=console)
+    baseline = BroadcastStats()
+    for command in commands:
+        for window in windows:
+            backend.focus(window)
+            backend.send(window, command)
+            backend.pause(window)
+        backend.restore(console)
+    baseline.commands = len(commands)
+    baseline.focus_switches = len(backend.focus_calls)
+    baseline.sends = baseline.successes = len(backend.sent)
+    baseline.elapsed = backend.clock()
+    print(f"config order : {baseline.summary()}")
+
+    for mode in MODES:
+        backend = FakeFocusBackend(foreground=console)
+        scheduler = BroadcastScheduler(backend, mode=mode, console_hwnd=console)
+        pending = list(commands)
+        while pending:
+            batch, pending = pending[:scheduler.batch_size], pending[scheduler.batch_size:]
+            scheduler.broadcast(batch, windows, more_pending=lambda: bool(pending))
+        print(f"{mode:<13}: {scheduler.totals.summary()}")
+
+
+if __name__ == "__main__":
+    simulate(["1qq", "swsw", "u", "j", "1qq", "swsw", "u", "j"])
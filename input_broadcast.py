@@ -7,19 +7,36 @@ Requirements:
 - pip install pywin32
 """
 
+import sys
 import time
 import threading
-import logging
-from typing import List, Tuple, Dict, Optional
-import sys
-import msvcrt
-import ctypes
+import queue
+from typing import List, Optional
+from pathlib import Path
+
+# Modules shared with autohonk.py live next to it and are imported by name, the same way
+# autohonk.py imports them, so each one is only ever loaded once
+SHARED_FOLDER = str(Path(__file__).resolve().parent / "autohonk")
+if SHARED_FOLDER not in sys.path:
+    sys.path.append(SHARED_FOLDER)
+
+# Heavy modules load on first use so startup doesn't compete with the game clients for disk
+from lazy_imports import lazy_logger, lazy_module
+
+msvcrt = lazy_module("msvcrt")
+ctypes = lazy_module("ctypes")
 
 # Windows API imports
-import win32api
-import win32con
-import win32gui
-import win32process
+win32api = lazy_module("win32api")
+win32con = lazy_module("win32con")
+win32gui = lazy_module("win32gui")
+win32process = lazy_module("win32process")
+
+# Adaptive timing (shared with autohonk.py)
+adaptive_timing = lazy_module("adaptive_timing")
+
+# Focus-change minimizing broadcast scheduler
+from broadcast_scheduler import BroadcastScheduler, FocusBackend, WindowEntry
 
 # Configuration
 CONFIG = {
@@ -29,19 +46,65 @@ CONFIG = {
     "primary_commander": "Duvrazh",
     "typing_timeout": 1.0,  # Wait 1 second after last keypress before sending
     "key_send_delay": 0.05,  # Delay between each key send (50ms)
+    "focus_settle": 0.2,  # Wait after focusing a window before sending keys
+    "window_switch_delay": 0.3,  # Pause between windows to avoid conflicts
+    "broadcast_mode": "sequential",  # "sequential" or "interleave" (batch queued commands per focus visit)
+    "interleave_batch": 4,  # Max queued commands sent per focus visit in interleave mode
+    "background_discovery": True,  # Look for Elite windows after input monitoring has started
+    "adaptive_timing": False,  # Learn the shortest delays per commander from Status.json changes
+    "confirm_timeout": 1.0,  # How long to wait for Status.json to confirm a command
+    # Commands that always toggle something in Status.json Flags/GuiFocus, and so can calibrate the
+    # delays (Elite's default keys: panels 1-4 change GuiFocus, L toggles the landing gear flag).
+    # Any other command is never a trial; an empty list turns calibration off.
+    "calibration_commands": ["1", "2", "3", "4", "l"],
+    # Status.json of each commander (Sandboxie boxes each have their own Saved Games folder)
+    "status_files": {
+        "Duvrazh": Path.home() / "Saved Games" / "Frontier Developments" / "Elite Dangerous" / "Status.json",
+    },
 }
 
-# Logging setup
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(), logging.FileHandler("elite_command_relay.log")],
-)
-logger = logging.getLogger(__name__)
+# Delays the relay learns, tested one at a time
+TIMING_PROBES = ("key_send_delay", "focus_settle", "window_switch_delay")
+
+# Logging setup (configured on first log record)
+logger = lazy_logger(__name__, "elite_command_relay.log")
+
+
+class Win32FocusBackend(FocusBackend):
+    """Real desktop focus backend for the broadcast scheduler."""
+
+    def __init__(self, relay: "CommandRelay"):
+        self.relay = relay
+
+    def get_foreground(self) -> Optional[int]:
+        try:
+            return win32gui.GetForegroundWindow()
+        except Exception:
+            return None
+
+    def focus(self, window: WindowEntry):
+        win32gui.SetForegroundWindow(window.hwnd)
+        time.sleep(self.relay.get_delay(window.commander, "focus_settle"))  # Brief delay to ensure focus
+
+    def send(self, window: WindowEntry, command: str) -> bool:
+        return self.relay.send_keys_to_window(window.hwnd, command, window.commander)
+
+    def pause(self, window: WindowEntry):
+        time.sleep(self.relay.get_delay(window.commander, "window_switch_delay"))  # Pause between windows to avoid conflicts
+
+    def restore(self, hwnd: int) -> bool:
+        try:
+            win32gui.SetForegroundWindow(hwnd)
+            time.sleep(0.1)
+            print("🔄 Console refocused")
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not refocus the console: {e}")
+            return False
 
 
 class CommandRelay:
-    def __init__(self):
+    def __init__(self, backend: Optional[FocusBackend] = None):
         self.all_commanders = CONFIG["commanders"] + [CONFIG["primary_commander"]]
         self.command_buffer = ""
         self.last_keypress_time = 0
@@ -50,10 +113,23 @@ class CommandRelay:
         self.timer_thread = None
         self.buffer_lock = threading.Lock()
         self.console_hwnd = None
+        self.timing_profiles = {}
+        self.pending_confirmations = set()  # Commanders with a timing trial still waiting on Status.json
+        self.confirmation_lock = threading.Lock()
+        self.broadcast_thread = None
+        self.command_queue = queue.Queue()
         
         # Get our console window handle
         self.console_hwnd = self.get_console_window()
-        
+        self.scheduler = BroadcastScheduler(
+            backend or Win32FocusBackend(self),
+            mode=CONFIG["broadcast_mode"],
+            interleave_batch=CONFIG["interleave_batch"],
+            console_hwnd=self.console_hwnd,
+        )
+
+    def print_banner(self):
+        """Print the startup banner and instructions."""
         print("=" * 70)
         print("Elite Dangerous Command Relay - Multi-Window Broadcasting v9")
         print("Using EXACT key sending mechanism from working autohonk.py")
@@ -62,6 +138,10 @@ class CommandRelay:
         print(f"Window title must contain: '{CONFIG['window_title_contains']}'")
         print(f"Named commanders: {', '.join(CONFIG['commanders'])}")
         print(f"Primary commander: {CONFIG['primary_commander']}")
+        print(f"Adaptive timing: {'On' if CONFIG['adaptive_timing'] else 'Off'}")
+        if CONFIG["adaptive_timing"]:
+            print(f"Calibration commands: {', '.join(map(repr, CONFIG['calibration_commands'])) or 'None (calibration off)'}")
+        print(f"Broadcast mode: {CONFIG['broadcast_mode']}")
         print("")
         print("INSTRUCTIONS:")
         print("1. Focus this console window")
@@ -80,13 +160,19 @@ class CommandRelay:
             logger.error(f"Error getting console window handle: {e}")
             return None
 
-    def find_elite_window(self, target_commander: str = None) -> Optional[int]:
-        """Find Elite Dangerous window handle - EXACT copy from autohonk.py"""
+    def enumerate_elite_windows(self) -> List[WindowEntry]:
+        """Every visible Elite Dangerous window, with the commander it belongs to - one EnumWindows pass."""
+        commanders = [(commander.lower(), commander) for commander in CONFIG["commanders"]]
+        title_filter = CONFIG["window_title_contains"].lower()
+
         def enum_windows_callback(hwnd, windows):
             try:
                 if win32gui.IsWindowVisible(hwnd):
                     # Get window title
                     title = win32gui.GetWindowText(hwnd)
+                    lower_title = title.lower()
+                    if title_filter not in lower_title:
+                        return True
                     
                     # Get process ID and name
                     _, pid = win32process.GetWindowThreadProcessId(hwnd)
@@ -95,20 +181,11 @@ class CommandRelay:
                     win32api.CloseHandle(process_handle)
                     
                     # Check if it's Elite Dangerous process with matching window title
-                    if 'elitedangerous64' in process_name and CONFIG['window_title_contains'].lower() in title.lower():
-                        if target_commander:
-                            # Looking for specific commander
-                            if target_commander in CONFIG["commanders"]:
-                                if target_commander.lower() in title.lower():
-                                    windows.append((hwnd, title, target_commander))
-                            elif target_commander == CONFIG["primary_commander"]:
-                                # Primary commander has no name in title
-                                has_other_commander = any(cmd.lower() in title.lower() for cmd in CONFIG["commanders"])
-                                if not has_other_commander:
-                                    windows.append((hwnd, title, target_commander))
-                        else:
-                            # Return any Elite window for testing
-                            windows.append((hwnd, title, "Unknown"))
+                    if 'elitedangerous64' in process_name:
+                        # Named commanders appear in the title; the primary commander has no name in title
+                        commander = next((name for lower_name, name in commanders if lower_name in lower_title),
+                                         CONFIG["primary_commander"])
+                        windows.append(WindowEntry(hwnd, title, commander))
                         
             except Exception:
                 pass
@@ -117,36 +194,17 @@ class CommandRelay:
         try:
             windows = []
             win32gui.EnumWindows(enum_windows_callback, windows)
-            
-            if windows:
-                hwnd, title, commander = windows[0]
-                logger.info(f"Found Elite window for {target_commander or 'testing'}: '{title}'")
-                return hwnd
-            else:
-                return None
-                
+            return windows
         except Exception as e:
-            logger.error(f"Error finding Elite window: {e}")
-            return None
+            logger.error(f"Error finding Elite windows: {e}")
+            return []
 
-    def find_all_elite_windows(self) -> List[Tuple[int, str, str]]:
-        """Find all Elite Dangerous windows."""
-        all_windows = []
-        
-        # Find each commander's window
-        for commander in CONFIG["commanders"]:
-            hwnd = self.find_elite_window(commander)
-            if hwnd:
-                title = win32gui.GetWindowText(hwnd)
-                all_windows.append((hwnd, title, commander))
-        
-        # Find primary commander window
-        hwnd = self.find_elite_window(CONFIG["primary_commander"])
-        if hwnd:
-            title = win32gui.GetWindowText(hwnd)
-            all_windows.append((hwnd, title, CONFIG["primary_commander"]))
-        
-        return all_windows
+    def find_all_elite_windows(self) -> List[WindowEntry]:
+        """Find all Elite Dangerous windows, one per commander in config order."""
+        found = {}
+        for window in self.enumerate_elite_windows():
+            found.setdefault(window.commander, window)
+        return [found[commander] for commander in self.all_commanders if commander in found]
 
     def get_virtual_key_code(self, key: str) -> Optional[int]:
         """Get Windows virtual key code - EXACT copy from autohonk.py"""
@@ -167,12 +225,57 @@ class CommandRelay:
         else:
             return None
 
+    def get_delay(self, commander: str, name: str) -> float:
+        """Get a delay from the commander's learned profile, or the fixed CONFIG value."""
+        if not CONFIG["adaptive_timing"] or commander not in CONFIG["status_files"]:
+            return CONFIG[name]
+        if commander not in self.timing_profiles:
+            self.timing_profiles[commander] = adaptive_timing.load_profile(
+                commander, {name: CONFIG[name] for name in TIMING_PROBES}, TIMING_PROBES)
+        return self.timing_profiles[commander].get(name)
+
+    def get_confirmation_watcher(self, commander: str) -> Optional["adaptive_timing.ConfirmationWatcher"]:
+        """Watcher for the commander's Status.json, if adaptive timing can learn for them."""
+        status_file = CONFIG["status_files"].get(commander)
+        if not CONFIG["adaptive_timing"] or not status_file or not Path(status_file).exists():
+            return None
+        return adaptive_timing.ConfirmationWatcher(status_file)
+
+    def start_timing_trial(self, commander: str, command: str):
+        """Snapshot Status.json before a send; returns (watcher, snapshot) or None if no trial runs."""
+        if command not in CONFIG["calibration_commands"]:
+            return None
+        watcher = self.get_confirmation_watcher(commander)
+        if not watcher:
+            return None
+        with self.confirmation_lock:
+            # One trial per commander at a time, so a late confirmation can't count for the next send
+            if commander in self.pending_confirmations:
+                return None
+            before = watcher.snapshot()
+            if before is None:
+                return None
+            self.pending_confirmations.add(commander)
+        return watcher, before
+
+    def record_timing(self, commander: str, confirmed: bool):
+        """Feed whether the command registered back into the delay being probed for the commander."""
+        with self.confirmation_lock:
+            self.pending_confirmations.discard(commander)
+        profile = self.timing_profiles.get(commander)
+        if not profile:
+            return
+        name = profile.record_probe(confirmed)
+        profile.save()
+        if name:
+            print(f"📈 {commander}: {'confirmed' if confirmed else 'missed'} - {name} now "
+                  f"{profile.delays[name].current * 1000:.0f} ms")
+
     def send_keys_to_window(self, hwnd: int, command: str, commander: str) -> bool:
-        """Send entire command to a window - EXACT method from autohonk.py"""
+        """Send entire command to the (already focused) window - EXACT method from autohonk.py"""
         try:
-            # Focus the window first - EXACT copy from autohonk.py
-            win32gui.SetForegroundWindow(hwnd)
-            time.sleep(0.2)  # Brief delay to ensure focus - same as autohonk
+            trial = self.start_timing_trial(commander, command)
+            key_send_delay = self.get_delay(commander, "key_send_delay")
             
             print(f"🎯 Sending '{command}' to {commander}...")
             
@@ -189,9 +292,16 @@ class CommandRelay:
                 win32api.keybd_event(vk_code, 0, win32con.KEYEVENTF_KEYUP, 0)  # Key up
                 
                 # Delay between keys
-                time.sleep(CONFIG["key_send_delay"])
+                time.sleep(key_send_delay)
             
             print(f"✅ Sent {len(command)} keys to {commander}")
+            
+            # Flags/GuiFocus changing means the game actually registered the command.
+            # Checked in the background so the next window isn't kept waiting.
+            if trial:
+                watcher, before = trial
+                watcher.confirm_in_background(before, CONFIG["confirm_timeout"],
+                                              lambda confirmed: self.record_timing(commander, confirmed))
             return True
             
         except Exception as e:
@@ -199,12 +309,14 @@ class CommandRelay:
             logger.error(f"Error sending keys to {commander}: {e}")
             return False
 
-    def send_command_to_all_windows(self, command: str):
-        """Send command sequence to all Elite Dangerous windows."""
-        if not command.strip():
+    def send_command_to_all_windows(self, commands: List[str]):
+        """Send a batch of queued commands to all Elite Dangerous windows."""
+        commands = [command for command in commands if command.strip()]
+        if not commands:
             return
             
-        print(f"\n🚀 Broadcasting command: '{command}' (length: {len(command)})")
+        for command in commands:
+            print(f"\n🚀 Broadcasting command: '{command}' (length: {len(command)})")
         
         # Find all Elite windows
         windows = self.find_all_elite_windows()
@@ -214,32 +326,48 @@ class CommandRelay:
             return
         
         print(f"📡 Found {len(windows)} Elite window(s):")
-        for _, title, commander in windows:
-            print(f"   • {commander}: {title}")
+        for window in windows:
+            print(f"   • {window.commander}: {window.title}")
         
         print("\n🎮 Sending commands...")
         
-        # Send to each window
-        success_count = 0
-        for hwnd, title, commander in windows:
-            if self.send_keys_to_window(hwnd, command, commander):
-                success_count += 1
-            time.sleep(0.3)  # Pause between windows to avoid conflicts
+        # Send to each window, starting with whichever already has focus.
+        # The console is only refocused once nothing else is queued.
+        stats = self.scheduler.broadcast(commands, windows, more_pending=lambda: not self.command_queue.empty())
         
-        print(f"\n🎉 Successfully sent to {success_count}/{len(windows)} windows")
-        
-        # Focus back to console
-        if self.console_hwnd:
-            try:
-                win32gui.SetForegroundWindow(self.console_hwnd)
-                time.sleep(0.1)
-                print("🔄 Console refocused")
-            except:
-                pass
+        print(f"\n🎉 Successfully sent {stats.successes}/{stats.sends} command(s)")
+        print(f"📊 This broadcast: {stats.summary()}")
+        print(f"📊 Session total: {self.scheduler.totals.summary()}")
         
         print("-" * 50)
         print("Ready for next command...")
 
+    def next_batch(self, timeout: float = 0.1) -> List[str]:
+        """Wait for a queued command, then take up to a batch of them (one in sequential mode)."""
+        try:
+            commands = [self.command_queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        
+        try:
+            while len(commands) < self.scheduler.batch_size:
+                commands.append(self.command_queue.get_nowait())
+        except queue.Empty:
+            pass
+        return commands
+
+    def broadcast_monitor(self):
+        """Drain queued commands and broadcast them, batching in interleave mode."""
+        while self.running:
+            commands = self.next_batch()
+            if not commands:
+                continue
+            
+            try:
+                self.send_command_to_all_windows(commands)
+            except Exception as e:
+                logger.error(f"Error in broadcast monitor: {e}")
+
     def input_monitor(self):
         """Monitor for keyboard input in the console."""
         print("🎧 Input monitor started. Type your commands...")
@@ -291,7 +419,7 @@ class CommandRelay:
                         self.last_keypress_time = 0
                         
                         print()  # New line
-                        self.send_command_to_all_windows(command_to_send)
+                        self.command_queue.put(command_to_send)
                 
                 time.sleep(0.1)
                 
@@ -299,20 +427,22 @@ class CommandRelay:
                 logger.error(f"Error in timer monitor: {e}")
                 time.sleep(0.1)
 
+    def test_window_detection(self):
+        """Test that we can find Elite windows."""
+        print("🔍 Testing window detection...")
+        windows = self.find_all_elite_windows()
+        if windows:
+            print(f"✅ Found {len(windows)} Elite window(s):")
+            for window in windows:
+                print(f"   • {window.commander}: {window.title}")
+        else:
+            print("⚠️  No Elite windows found - make sure Elite is running!")
+
     def run(self):
         """Main execution logic."""
         try:
-            # Test that we can find Elite windows
-            print("🔍 Testing window detection...")
-            windows = self.find_all_elite_windows()
-            if windows:
-                print(f"✅ Found {len(windows)} Elite window(s):")
-                for _, title, commander in windows:
-                    print(f"   • {commander}: {title}")
-            else:
-                print("⚠️  No Elite windows found - make sure Elite is running!")
-            
-            print("\n🎮 Ready for input! Type commands and wait 1 second...")
+            if not CONFIG["background_discovery"]:
+                self.test_window_detection()
             
             # Start monitoring threads
             self.input_thread = threading.Thread(target=self.input_monitor, daemon=True)
@@ -321,6 +451,16 @@ class CommandRelay:
             self.timer_thread = threading.Thread(target=self.timer_monitor, daemon=True)
             self.timer_thread.start()
             
+            self.broadcast_thread = threading.Thread(target=self.broadcast_monitor, daemon=True)
+            self.broadcast_thread.start()
+            
+            # Input is already being accepted - now the banner and window discovery
+            self.print_banner()
+            if CONFIG["background_discovery"]:
+                threading.Thread(target=self.test_window_detection, daemon=True).start()
+            
+            print("\n🎮 Ready for input! Type commands and wait 1 second...")
+            
             # Main loop
             while self.running:
                 time.sleep(0.1)
@@ -0,0 +1,176 @@
+"""
+Elite Dangerous Tools - Memory Benchmark
+Uses tracemalloc to compare plain json.loads dicts with JournalEvent records (memory kept
+and transient allocations per decode), to measure transient allocations per broadcast, and
+to track memory over a long multi-commander session. Runs without Windows or pywin32 (broadcasts use FakeFocusBackend).
+
+Usage:
+- python memory_bench.py                 (default sizes)
+- python memory_bench.py --events 500000 (longer session)
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+from typing import List
+
+# Shared modules are imported by name from the autohonk folder, like the tools do
+sys.path.append(str(Path(__file__).resolve().parent / "autohonk"))
+from journal_records import decode_event, msgspec
+from broadcast_scheduler import BroadcastScheduler, FakeFocusBackend, WindowEntry
+
+# Configuration
+CONFIG = {
+    "commanders": ["Duvrazh", "Bistronaut", "Tristronaut", "Quadstronaut"],
+    "systems": 2000,  # Distinct systems visited during the simulated session
+    "history": 10000,  # Events kept per commander when measuring retained memory
+}
+
+
+def generate_lines(count: int, seed: int = 0) -> List[bytes]:
+    """Realistic mix of journal lines for several commanders."""
+    rng = random.Random(seed)
+    systems = [f"Synuefe {chr(65 + i % 26)}{chr(65 + i // 26 % 26)}-{i % 10} d{i % 97}" for i in range(CONFIG["systems"])]
+    lines = []
+    second = 0
+    while len(lines) < count:
+        commander = rng.choice(CONFIG["commanders"])
+        system = rng.choice(systems)
+        second += rng.randint(1, 60)
+        stamp = f"2024-{1 + second // 2592000 % 12:02d}-{1 + second // 86400 % 28:02d}T{second // 3600 % 24:02d}:{second // 60 % 60:02d}:{second % 60:02d}Z"
+        kind = rng.random()
+        if kind < 0.05:
+            lines.append(f'{{ "timestamp":"{stamp}", "event":"LoadGame", "Commander":"{commander}", "Ship":"Anaconda", "Credits":{rng.getrandbits(32)} }}')
+        elif kind < 0.35:
+            lines.append(f'{{ "timestamp":"{stamp}", "event":"FSDJump", "StarSystem":"{system}", "SystemAddress":{rng.getrandbits(40)}, '
+                         f'"StarPos":[{rng.uniform(-1e3, 1e3):.5f},{rng.uniform(-1e3, 1e3):.5f},{rng.uniform(-1e3, 1e3):.5f}], "JumpDist":{rng.uniform(10, 70):.3f} }}')
+        elif kind < 0.65:
+            lines.append(f'{{ "timestamp":"{stamp}", "event":"FSSDiscoveryScan", "Progress":0.0, "BodyCount":{rng.randint(1, 60)}, '
+                         f'"NonBodyCount":{rng.randint(0, 20)}, "SystemName":"{system}" }}')
+        else:
+            lines.append(f'{{ "timestamp":"{stamp}", "event":"Scan", "ScanType":"AutoScan", "BodyName":"{system} {rng.randint(1, 9)}", '
+                         f'"StarSystem":"{system}", "DistanceFromArrivalLS":{rng.uniform(0, 5000):.6f} }}')
+    return [line.encode("utf-8") for line in lines[:count]]
+
+
+def measure_retained(decode, lines: List[bytes]) -> tuple:
+    """(bytes per event, blocks per event, microseconds per event) while keeping every decoded event."""
+    tracemalloc.start()
+    before_bytes, _ = tracemalloc.get_traced_memory()
+    before_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    start = time.perf_counter()
+    kept = [decode(line) for line in lines]
+    elapsed = time.perf_counter() - start
+    after_bytes, _ = tracemalloc.get_traced_memory()
+    after_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    count = len(kept)
+    return ((after_bytes - before_bytes) / count, (after_blocks - before_blocks) / count, elapsed / count * 1e6)
+
+
+def measure_transient(decode, lines: List[bytes]) -> tuple:
+    """(mean, p99) peak bytes allocated while decoding one line, with nothing kept afterwards.
+
+    This is what a tailer that handles each event and drops it (autohonk.py) pays.
+    """
+    for line in lines[:100]:
+        decode(line)  # Warm up interned strings and one-off caches
+    tracemalloc.start()
+    peaks = []
+    for line in lines:
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        decode(line)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+    peaks.sort()
+    # p99 rather than max: the odd interned-string table resize would dominate a max
+    return (sum(peaks) / len(peaks), peaks[int(len(peaks) * 0.99)])
+
+
+def bench_events(lines: List[bytes]):
+    print(f"🧾 Journal events ({len(lines):,} lines, decoder: {'msgspec' if msgspec else 'json fallback'})")
+    for name, decode in (("json.loads dict", json.loads), ("JournalEvent", decode_event)):
+        per_bytes, per_blocks, per_us = measure_retained(decode, lines)
+        mean_peak, p99_peak = measure_transient(decode, lines)
+        print(f"   • {name:<16} kept {per_bytes:5.0f} B/event  {per_blocks:5.1f} blocks/event  {per_us:5.1f} µs/event  "
+              f"| transient peak {mean_peak:5.0f} B/decode (p99 {p99_peak:,} B)")
+
+
+class QuietBackend(FakeFocusBackend):
+    """FakeFocusBackend that doesn't keep a history, so only broadcast overhead is traced."""
+
+    def focus(self, window):
+        self.foreground = window.hwnd
+
+    def send(self, window, command):
+        return True
+
+    def restore(self, hwnd):
+        self.foreground = hwnd
+        return True
+
+
+def bench_broadcasts(count: int):
+    windows = [WindowEntry(100 + i, f"Elite - Dangerous (CLIENT) {name}", name)
+               for i, name in enumerate(CONFIG["commanders"])]
+    print(f"📡 Broadcasts ({count:,} x {len(windows)} windows)")
+    print(f"   • WindowEntry {sys.getsizeof(windows[0])} B vs (hwnd, title, commander) tuple "
+          f"{sys.getsizeof((1, 'title', 'commander'))} B")
+    for mode in ("sequential", "interleave"):
+        scheduler = BroadcastScheduler(QuietBackend(foreground=1), mode=mode, console_hwnd=1)
+        commands = ["1qq"] * scheduler.batch_size
+        scheduler.broadcast(commands, windows)  # Warm up
+        tracemalloc.start()
+        transient = 0
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(count):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            scheduler.broadcast(commands, windows)
+            transient += tracemalloc.get_traced_memory()[1] - current
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"   • {mode:<10} peak {transient / count:6.0f} B transient/broadcast, "
+              f"{(after - before) / count:5.1f} B retained/broadcast")
+
+
+def bench_session(lines: List[bytes]):
+    """Long multi-commander session: per-commander recent history, memory at checkpoints."""
+    print(f"⏳ Long session ({len(lines):,} events, last {CONFIG['history']:,} kept per commander)")
+    for name, decode in (("json.loads dict", json.loads), ("JournalEvent", decode_event)):
+        history = {commander: deque(maxlen=CONFIG["history"]) for commander in CONFIG["commanders"]}
+        commanders = CONFIG["commanders"]
+        tracemalloc.start()
+        checkpoints = []
+        for i, line in enumerate(lines, 1):
+            history[commanders[i % len(commanders)]].append(decode(line))
+            if i % (len(lines) // 4) == 0:
+                checkpoints.append(tracemalloc.get_traced_memory()[0])
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"   • {name:<16} " + " -> ".join(f"{mb / 1024 ** 2:.1f}" for mb in checkpoints)
+              + f" MB (peak {peak / 1024 ** 2:.1f} MB)")
+
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="tracemalloc benchmark for journal events and broadcasts.")
+    parser.add_argument("--events", type=int, default=200000, help="journal lines to decode")
+    parser.add_argument("--broadcasts", type=int, default=2000, help="broadcasts to run")
+    args = parser.parse_args(argv[1:])
+
+    lines = generate_lines(args.events)
+    bench_events(lines[:min(len(lines), 50000)])
+    bench_broadcasts(args.broadcasts)
+    bench_session(lines)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,96 @@
+"""
+Elite Dangerous Tools - Startup Benchmark
+Imports each tool in a fresh interpreter with `-X importtime`, reports the slowest
+imports, and fails if a tool goes over its budget or eagerly imports a heavy module.
+Get-Wing.ps1 starts these scripts alongside four game clients, so cold start matters.
+
+Usage:
+- python startup_bench.py            (check budgets, exit code 1 on failure)
+- python startup_bench.py --runs 10  (best of 10 runs per tool)
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent
+
+# Configuration
+CONFIG = {
+    # tool name: (folder added to sys.path, module to import, budget in milliseconds)
+    "tools": {
+        "input_broadcast": (ROOT, "input_broadcast", 50.0),
+        "autohonk": (ROOT / "autohonk", "autohonk", 50.0),
+    },
+    # Modules that must only load once they are actually needed
+    "deferred_modules": [
+        "win32api", "win32con", "win32gui", "win32process", "msvcrt", "ctypes",
+        "watchdog", "logging", "xml.etree.ElementTree", "sqlite3",
+        "adaptive_timing", "journal_index", "journal_records",
+    ],
+    "show_slowest": 8,
+}
+
+
+def import_times(folder: Path, module: str) -> List[Tuple[str, int, int]]:
+    """Import a module in a fresh interpreter; return (name, self_us, cumulative_us) rows."""
+    code = f"import sys; sys.path.insert(0, {str(folder)!r}); import {module}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=str(folder),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def check_tool(name: str, folder: Path, module: str, budget_ms: float, runs: int) -> bool:
+    """Benchmark one tool; return True if it is within budget."""
+    best: Dict[str, Tuple[int, int]] = {}
+    total_us = None
+    for _ in range(runs):
+        rows = import_times(folder, module)
+        run_total = next(cumulative for row_name, _, cumulative in rows if row_name == module)
+        if total_us is None or run_total < total_us:
+            total_us = run_total
+            best = {row_name: (self_us, cumulative) for row_name, self_us, cumulative in rows}
+
+    total_ms = total_us / 1000
+    ok = total_ms <= budget_ms
+    status = "✅" if ok else "❌"
+    print(f"{status} {name}: {total_ms:.1f} ms import (budget {budget_ms:.0f} ms, best of {runs})")
+
+    for row_name, (self_us, _) in sorted(best.items(), key=lambda item: -item[1][0])[:CONFIG["show_slowest"]]:
+        print(f"     {self_us / 1000:6.1f} ms  {row_name}")
+
+    eager = [module_name for module_name in CONFIG["deferred_modules"] if module_name in best]
+    if eager:
+        ok = False
+        print(f"   ❌ Imported at startup but should be lazy: {', '.join(eager)}")
+    return ok
+
+
+def main(argv: List[str]) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Check import-time budgets for the Python tools.")
+    parser.add_argument("--runs", type=int, default=5, help="runs per tool (best is reported)")
+    args = parser.parse_args(argv[1:])
+
+    ok = True
+    for name, (folder, module, budget_ms) in CONFIG["tools"].items():
+        ok = check_tool(name, folder, module, budget_ms, args.runs) and ok
+    print("🎉 All tools within startup budget" if ok else "⚠️ Startup budget exceeded")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
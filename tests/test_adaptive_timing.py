@@ -0,0 +1,113 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from adaptive_timing import CONFIG, AdaptiveDelay, ConfirmationWatcher, TimingProfile, replay
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+RELAY_DEFAULTS = {"key_send_delay": 0.05, "focus_settle": 0.2, "window_switch_delay": 0.3}
+
+
+def test_miss_ceiling_blocks_tightening_then_expires():
+    delay = AdaptiveDelay("focus_settle", default=0.2, minimum=0.01, current=0.1)
+    delay.miss()
+    assert delay.miss_ceiling == 0.1
+    assert delay.current > 0.1
+
+    # Right after a miss the delay may not shrink back into the value that missed
+    for _ in range(CONFIG["miss_expiry"] - 1):
+        delay.success()
+    assert delay.current > 0.1
+    assert delay.miss_ceiling == 0.1
+
+    delay.success()
+    assert delay.miss_ceiling == 0.0
+    for _ in range(CONFIG["successes_to_shrink"] * 10):
+        delay.success()
+    assert delay.current < 0.1
+
+
+def test_profile_round_trip(tmp_path):
+    profile = TimingProfile("Bistronaut", RELAY_DEFAULTS, folder=tmp_path)
+    profile.record("key_send_delay", False)
+    profile.record("key_send_delay", True)
+    profile.save()
+
+    loaded = TimingProfile("Bistronaut", RELAY_DEFAULTS, folder=tmp_path).load()
+    original = profile.delays["key_send_delay"]
+    restored = loaded.delays["key_send_delay"]
+    assert restored.current == round(original.current, 4)
+    assert restored.miss_ceiling == round(original.miss_ceiling, 4)
+    assert restored.successes_since_miss == 1
+
+
+def test_tool_config_is_the_ceiling(tmp_path):
+    # A user who needs 3s after a jump must be able to back off all the way to 3s
+    profile = TimingProfile("Duvrazh", {"delay_after_jump": 3.0}, folder=tmp_path)
+    profile.delays["delay_after_jump"].current = 1.0
+    for _ in range(5):
+        profile.record("delay_after_jump", False)
+    assert profile.get("delay_after_jump") == 3.0
+
+
+def test_save_keeps_the_other_tools_delays(tmp_path):
+    TimingProfile("Duvrazh", {"delay_after_jump": 2.0, "focus_settle": 0.2}, folder=tmp_path).save()
+    relay = TimingProfile("Duvrazh", RELAY_DEFAULTS, folder=tmp_path)
+    relay.record("key_send_delay", False)
+    relay.save()
+
+    autohonk = TimingProfile("Duvrazh", {"delay_after_jump": 2.0}, folder=tmp_path).load()
+    assert autohonk.get("delay_after_jump") == 2.0
+    assert json.loads(relay.path.read_text())["delays"].keys() == {
+        "delay_after_jump", "focus_settle", "key_send_delay", "window_switch_delay"}
+
+
+def test_trial_only_moves_the_probed_delay(tmp_path):
+    profile = TimingProfile("Bistronaut", RELAY_DEFAULTS, folder=tmp_path, probes=("key_send_delay", "focus_settle"))
+    assert profile.probe == "key_send_delay"
+    assert profile.record_probe(False) == "key_send_delay"
+
+    # The miss backed off key_send_delay only, and the next trial probes focus_settle
+    assert profile.delays["focus_settle"].trials == 0
+    assert profile.probe == "focus_settle"
+
+    for _ in range(CONFIG["successes_to_shrink"]):
+        profile.record_probe(True)
+    shrunk = profile.delays["focus_settle"]
+    assert shrunk.current < shrunk.last_good
+    # Not confirmed yet, so other trials keep using the last value that worked
+    assert profile.probe == "key_send_delay"
+    assert profile.get("focus_settle") == shrunk.last_good
+
+
+def test_watcher_ignores_unrelated_status_changes(tmp_path):
+    status = tmp_path / "Status.json"
+    status.write_text(json.dumps({"Flags": 16777240, "GuiFocus": 0, "Fuel": {"FuelMain": 32.0}}))
+    watcher = ConfirmationWatcher(status)
+    before = watcher.snapshot()
+
+    status.write_text(json.dumps({"Flags": 16777240, "GuiFocus": 0, "Fuel": {"FuelMain": 31.5}}))
+    assert not watcher.wait_for_change(before, timeout=0.05, poll=0.01)
+
+    status.write_text("{")  # Mid-write
+    assert not watcher.wait_for_change(before, timeout=0.05, poll=0.01)
+
+    status.write_text(json.dumps({"Flags": 16777244, "GuiFocus": 0, "Fuel": {"FuelMain": 31.5}}))
+    assert watcher.wait_for_change(before, timeout=0.05, poll=0.01)
+
+
+@pytest.mark.parametrize("fixture, max_miss_rate, max_delay_ratio", [
+    ("autohonk_timing.json", 0.07, 0.75),
+    ("input_broadcast_timing.json", 0.07, 0.82),
+])
+def test_replay_beats_fixed_defaults(fixture, max_miss_rate, max_delay_ratio):
+    result = replay(json.loads((FIXTURES / fixture).read_text()))
+
+    assert result["trials"] == 200
+    assert result["miss_rate"] <= max_miss_rate
+    assert result["total_delay"] <= result["baseline_delay"] * max_delay_ratio
+    # Every delay the tool uses took part in the probe rotation
+    defaults = json.loads((FIXTURES / fixture).read_text())["defaults"]
+    assert all(result["final"][name] < default for name, default in defaults.items())
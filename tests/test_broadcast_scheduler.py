@@ -0,0 +1,101 @@
+import pytest
+
+from broadcast_scheduler import BroadcastScheduler, FakeFocusBackend, WindowEntry
+
+CONSOLE = 1
+
+
+def make_windows(count=3):
+    return [WindowEntry(100 + i, f"Elite - Dangerous (CLIENT) {i}", f"CMDR{i}") for i in range(count)]
+
+
+def test_focused_window_goes_first_and_is_not_refocused():
+    windows = make_windows()
+    backend = FakeFocusBackend(foreground=101)
+    scheduler = BroadcastScheduler(backend, console_hwnd=CONSOLE)
+
+    stats = scheduler.broadcast(["1qq"], windows)
+
+    assert [hwnd for hwnd, _ in backend.sent] == [101, 102, 100]
+    assert 101 not in backend.focus_calls
+    assert backend.focus_calls == [102, 100, CONSOLE]
+    assert stats.focus_switches == 3
+
+
+def test_no_console_refocus_while_more_pending():
+    windows = make_windows()
+    backend = FakeFocusBackend(foreground=CONSOLE)
+    scheduler = BroadcastScheduler(backend, console_hwnd=CONSOLE)
+
+    scheduler.broadcast(["1qq"], windows, more_pending=lambda: True)
+    assert CONSOLE not in backend.focus_calls
+    assert backend.foreground == 102
+
+    # The next command starts on the window left focused, then refocuses the console
+    stats = scheduler.broadcast(["swsw"], windows)
+    assert [hwnd for hwnd, command in backend.sent if command == "swsw"] == [102, 100, 101]
+    assert backend.foreground == CONSOLE
+    assert stats.focus_switches == 3
+
+
+def test_interleave_sends_batch_per_visit():
+    windows = make_windows()
+    backend = FakeFocusBackend(foreground=CONSOLE)
+    scheduler = BroadcastScheduler(backend, mode="interleave", interleave_batch=3, console_hwnd=CONSOLE)
+    commands = ["1qq", "swsw", "u"]
+
+    stats = scheduler.broadcast(commands, windows)
+
+    assert backend.sent == [(window.hwnd, command) for window in windows for command in commands]
+    assert backend.focus_calls == [100, 101, 102, CONSOLE]
+    assert stats.focus_switches == 4
+    assert stats.sends == stats.successes == 9
+
+
+def test_sequential_focus_switch_counts():
+    windows = make_windows(4)
+    backend = FakeFocusBackend(foreground=CONSOLE)
+    scheduler = BroadcastScheduler(backend, console_hwnd=CONSOLE)
+
+    stats = scheduler.broadcast(["a", "b", "c"], windows)
+
+    # 4 for the first command, 3 for each later one (last window is already focused), 1 console
+    assert stats.focus_switches == 4 + 3 + 3 + 1
+    assert scheduler.totals.focus_switches == stats.focus_switches
+    assert stats.switches_per_command == pytest.approx(11 / 3)
+
+
+def test_focus_failure_skips_only_that_window():
+    class FailingBackend(FakeFocusBackend):
+        def focus(self, window):
+            if window.hwnd == 101:
+                raise RuntimeError("focus refused")
+            super().focus(window)
+
+    windows = make_windows()
+    backend = FailingBackend(foreground=CONSOLE)
+    scheduler = BroadcastScheduler(backend, console_hwnd=CONSOLE)
+
+    stats = scheduler.broadcast(["1qq"], windows)
+
+    assert [hwnd for hwnd, _ in backend.sent] == [100, 102]
+    assert stats.successes == 2 and stats.sends == 3
+    assert backend.foreground == CONSOLE
+
+
+def test_failed_console_restore_is_not_a_focus_switch():
+    class StuckBackend(FakeFocusBackend):
+        def restore(self, hwnd):
+            return False
+
+    backend = StuckBackend(foreground=CONSOLE)
+    scheduler = BroadcastScheduler(backend, console_hwnd=CONSOLE)
+
+    stats = scheduler.broadcast(["1qq"], make_windows())
+
+    assert stats.focus_switches == 3
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        BroadcastScheduler(FakeFocusBackend(), mode="round-robin")
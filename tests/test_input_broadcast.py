@@ -0,0 +1,118 @@
+import json
+import time
+
+import pytest
+
+import adaptive_timing
+import input_broadcast
+from broadcast_scheduler import FakeFocusBackend, WindowEntry
+from input_broadcast import CommandRelay
+
+CONSOLE = 1
+
+
+@pytest.fixture
+def make_relay(monkeypatch):
+    def make(mode="sequential", windows=3):
+        monkeypatch.setitem(input_broadcast.CONFIG, "broadcast_mode", mode)
+        monkeypatch.setattr(CommandRelay, "get_console_window", lambda self: CONSOLE)
+        entries = [WindowEntry(100 + i, f"Elite - Dangerous (CLIENT) {i}", f"CMDR{i}") for i in range(windows)]
+        monkeypatch.setattr(CommandRelay, "find_all_elite_windows", lambda self: entries)
+        backend = FakeFocusBackend(foreground=CONSOLE)
+        return CommandRelay(backend), backend
+    return make
+
+
+def test_queued_commands_keep_focus_off_the_console(make_relay):
+    relay, backend = make_relay()
+    for command in ("1qq", "swsw"):
+        relay.command_queue.put(command)
+
+    relay.send_command_to_all_windows(relay.next_batch())
+    # Another command is still queued, so focus stays on the game
+    assert CONSOLE not in backend.focus_calls
+    relay.send_command_to_all_windows(relay.next_batch())
+
+    assert backend.focus_calls[-1] == CONSOLE
+    assert backend.focus_calls.count(CONSOLE) == 1
+    assert [command for _, command in backend.sent] == ["1qq"] * 3 + ["swsw"] * 3
+    assert relay.next_batch(timeout=0) == []
+
+
+def test_interleave_drains_a_batch_per_broadcast(make_relay):
+    relay, backend = make_relay(mode="interleave")
+    for command in ("1", "2", "3", "4", "5"):
+        relay.command_queue.put(command)
+
+    batch = relay.next_batch()
+    assert batch == ["1", "2", "3", "4"]
+    relay.send_command_to_all_windows(batch)
+
+    # One focus per window for the whole batch, and no console refocus while "5" waits
+    assert backend.focus_calls == [100, 101, 102]
+    assert len(backend.sent) == 12
+    assert relay.next_batch() == ["5"]
+
+
+class FakeKeys:
+    """Stands in for win32api/win32con; pressing L toggles the landing gear flag in Status.json."""
+
+    KEYEVENTF_KEYUP = 2
+
+    def __init__(self, status):
+        self.status = status
+        self.pressed = []
+
+    def __getattr__(self, name):
+        return 0  # Virtual key constants
+
+    def keybd_event(self, vk_code, scan, flags, extra):
+        if flags == 0:
+            self.pressed.append(chr(vk_code))
+            if vk_code == ord("L"):
+                data = json.loads(self.status.read_text())
+                data["Flags"] ^= 4
+                self.status.write_text(json.dumps(data))
+
+
+@pytest.fixture
+def calibrating_relay(make_relay, monkeypatch, tmp_path):
+    status = tmp_path / "Status.json"
+    status.write_text(json.dumps({"Flags": 16777240, "GuiFocus": 0}))
+    keys = FakeKeys(status)
+    monkeypatch.setattr(input_broadcast, "win32api", keys)
+    monkeypatch.setattr(input_broadcast, "win32con", keys)
+    monkeypatch.setitem(adaptive_timing.CONFIG, "profile_folder", tmp_path / "profiles")
+    monkeypatch.setitem(input_broadcast.CONFIG, "adaptive_timing", True)
+    monkeypatch.setitem(input_broadcast.CONFIG, "confirm_timeout", 0.2)
+    monkeypatch.setitem(input_broadcast.CONFIG, "status_files", {"CMDR0": status})
+    relay, _ = make_relay()
+    return relay
+
+
+def wait_for_trials(relay):
+    deadline = time.time() + 2
+    while relay.pending_confirmations and time.time() < deadline:
+        time.sleep(0.01)
+    assert not relay.pending_confirmations
+
+
+def test_only_calibration_commands_are_timing_trials(calibrating_relay):
+    relay = calibrating_relay
+    relay.get_delay("CMDR0", "key_send_delay")  # Loads the profile
+    profile = relay.timing_profiles["CMDR0"]
+
+    relay.send_keys_to_window(100, "1qq", "CMDR0")  # Never toggles a flag by itself
+    assert not relay.pending_confirmations
+    relay.send_keys_to_window(100, "l", "CMDR0")
+    wait_for_trials(relay)
+
+    probed = profile.delays["key_send_delay"]
+    assert (probed.trials, probed.misses) == (1, 0)
+    assert sum(delay.trials for delay in profile.delays.values()) == 1
+
+
+def test_empty_calibration_list_turns_calibration_off(calibrating_relay, monkeypatch):
+    monkeypatch.setitem(input_broadcast.CONFIG, "calibration_commands", [])
+    calibrating_relay.send_keys_to_window(100, "l", "CMDR0")
+    assert not calibrating_relay.pending_confirmations
@@ -0,0 +1,95 @@
+import journal_bulk
+from journal_index import JournalIndex, generate_corpus
+
+EVENTS = ("SELECT e.ts, c.name, t.name, s.name, e.offset FROM events e "
+          "LEFT JOIN commanders c ON c.id = e.commander JOIN event_types t ON t.id = e.event "
+          "LEFT JOIN systems s ON s.id = e.system ORDER BY e.ts, e.offset")
+JUMPS = ("SELECT j.ts, c.name, s.name, j.offset, j.scan_ts FROM jumps j "
+         "LEFT JOIN commanders c ON c.id = j.commander LEFT JOIN systems s ON s.id = j.system ORDER BY j.ts, j.offset")
+FILES = "SELECT path, indexed_offset, pending_jump FROM files ORDER BY path"
+
+
+def make_corpus(tmp_path, boxes=2):
+    folders = [tmp_path / f"box{box}" for box in range(1, boxes + 1)]
+    for seed, folder in enumerate(folders):
+        generate_corpus(folder, 200 * 1024, seed=seed)
+    # The live journal ends in a line that is still being written
+    with open(next(folders[-1].glob("Journal.*.log")), "a", encoding="utf-8") as f:
+        f.write('{ "timestamp":"2031-01-01T00:00:00Z", "event":"FSDJ')
+    return folders
+
+
+def test_backfill_matches_incremental_index(tmp_path, monkeypatch):
+    folders = make_corpus(tmp_path)
+    monkeypatch.setitem(journal_bulk.CONFIG, "chunk_bytes", 16 * 1024)  # Several chunks per file
+
+    incremental = JournalIndex(tmp_path / "incremental.sqlite")
+    for folder in folders:
+        for path in folder.glob("Journal.*.log"):
+            incremental.index_file(path)
+    backfilled = JournalIndex(tmp_path / "backfilled.sqlite")
+    totals = backfilled.index_folders(folders, workers=2)
+
+    assert totals["files"] == 2
+    for sql in (EVENTS, JUMPS, FILES):
+        assert backfilled.query(sql) == incremental.query(sql)
+
+    # A later catch-up picks up exactly where the backfill stopped
+    assert backfilled.index_folders(folders)["events"] == 0
+    incremental.close()
+    backfilled.close()
+
+
+def test_parse_corpus_streams_in_timestamp_order(tmp_path):
+    paths = [path for folder in make_corpus(tmp_path) for path in folder.glob("Journal.*.log")]
+
+    rows = list(journal_bulk.parse_corpus(paths, workers=1, project=journal_bulk.summarize, chunk_bytes=16 * 1024))
+
+    assert [row[:3] for row in rows] == sorted(row[:3] for row in rows)
+    assert len({row[1] for row in rows}) == 2
+    assert not any(row[0] == "2031-01-01T00:00:00Z" for row in rows)
+
+
+def test_new_journals_are_backfilled_after_the_live_one_was_indexed(tmp_path, monkeypatch):
+    folders = make_corpus(tmp_path, boxes=3)
+    live, *history = [next(folder.glob("Journal.*.log")) for folder in folders]
+    backfilled = []
+    original = JournalIndex.backfill
+
+    def spy(self, files, workers=None):
+        backfilled.extend(files)
+        return original(self, files, workers)
+
+    monkeypatch.setattr(JournalIndex, "backfill", spy)
+
+    # autohonk's tailer indexes the live journal before anyone runs a build
+    index = JournalIndex(tmp_path / "index.sqlite")
+    index.index_file(live)
+    totals = index.index_folders(folders, workers=2)
+
+    assert sorted(backfilled) == sorted(history)
+    assert totals["files"] == 3
+    reference = JournalIndex(tmp_path / "reference.sqlite")
+    for path in (live, *history):
+        reference.index_file(path)
+    assert index.query(JUMPS) == reference.query(JUMPS)
+    index.close()
+    reference.close()
+
+
+def test_two_indexers_on_one_database_never_duplicate_rows(tmp_path):
+    live = next(make_corpus(tmp_path, boxes=1)[0].glob("Journal.*.log"))
+    tailer = JournalIndex(tmp_path / "index.sqlite")
+    build = JournalIndex(tmp_path / "index.sqlite")  # e.g. journal_index.py build in another process
+
+    tailer.index_file(live)
+    with open(live, "a", encoding="utf-8") as f:
+        f.write('ump", "StarSystem":"Sol" }\n')  # Completes the partial FSDJump line
+    build.index_file(live)  # Stale name caches and offsets must not matter
+    tailer.index_file(live)
+
+    reference = JournalIndex(tmp_path / "reference.sqlite")
+    reference.index_file(live)
+    assert tailer.query(EVENTS) == reference.query(EVENTS)
+    for index in (tailer, build, reference):
+        index.close()